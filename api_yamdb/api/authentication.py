@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .cache import new_version
+
+
+class UserCache:
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, row = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return row
+
+    def set(self, user_id, row):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, row)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
+
+
+def user_version_key(user_id):
+    return f'user:{user_id}:version'
+
+
+def get_user_version(user_id):
+    # Строка в кеше процесса годна, пока совпадает с версией в общем кеше:
+    # так изменение пользователя в одном процессе видят все остальные.
+    shared = caches['shared']
+    key = user_version_key(user_id)
+    version = shared.get(key)
+    if version is None:
+        shared.add(key, new_version(), None)
+        version = shared.get(key)
+    return version
+
+
+def renew_user_version(user_id):
+    # QuerySet.update() не отправляет сигналов, поэтому после массового
+    # изменения пользователей версию нужно обновить вручную.
+    caches['shared'].set(user_version_key(user_id), new_version(), None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        # Версия читается до загрузки пользователя: изменение, случившееся
+        # между ними, сменит версию, и строка будет перечитана.
+        version = get_user_version(user_id)
+        row = user_cache.get(user_id)
+        if row is None or row[0] != version:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, (
+                version,
+                user._state.db,
+                [getattr(user, field.attname)
+                 for field in user._meta.concrete_fields],
+            ))
+            return user
+        _, db, values = row
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+        ]
+        return self.user_model.from_db(db, field_names, values)
@@ -0,0 +1,99 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from api_yamdb.routers import reading_from_replica
+from reviews.models import Category, Genre, Title
+
+CACHE_PREFIX = 'catalog'
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+CATALOG_DEPENDENCIES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles',),
+}
+
+
+def version_key(resource):
+    return f'{CACHE_PREFIX}:version:{resource}'
+
+
+def new_version():
+    return uuid.uuid4().hex
+
+
+def get_version(resource):
+    # Версии хранятся в общем кеше: запись в одном процессе должна
+    # сбрасывать страницы, закешированные остальными.
+    shared = caches['shared']
+    key = version_key(resource)
+    version = shared.get(key)
+    if version is None:
+        shared.add(key, new_version(), None)
+        version = shared.get(key)
+    return version
+
+
+def renew_versions(resources):
+    # Файловый кеш выполняет incr как чтение и запись, и два процесса
+    # могли бы получить одно и то же значение; случайная версия всегда нова.
+    shared = caches['shared']
+    for resource in resources:
+        shared.set(version_key(resource), new_version(), None)
+
+
+def bump_version(*resources):
+    # До фиксации транзакции параллельный читатель ещё видит старые строки
+    # и закешировал бы их под новой версией.
+    transaction.on_commit(lambda: renew_versions(resources))
+
+
+def bump_model_version(model):
+    bump_version(*CATALOG_DEPENDENCIES.get(model, ()))
+
+
+def response_cache_key(resource, request):
+    url = hashlib.md5(request.build_absolute_uri().encode('utf-8'))
+    return (f'{CACHE_PREFIX}:{resource}:{get_version(resource)}:'
+            f'{url.hexdigest()}')
+
+
+class CachedListMixin:
+    cache_resource = None
+
+    def get_cache_timeout(self):
+        # Реплика может отставать: её данные не должны жить в кеше дольше
+        # окна задержки, иначе новая версия каталога закрепит старые строки.
+        if reading_from_replica():
+            return settings.REPLICA_LAG
+        return settings.CATALOG_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        key = response_cache_key(self.cache_resource, request)
+        cached = cache.get(key)
+        if cached is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code == 200:
+                headers = {
+                    header: response[header] for header in CACHED_HEADERS
+                    if response.has_header(header)
+                }
+                cache.set(key, (response.data, headers),
+                          self.get_cache_timeout())
+            return response
+
+        data, headers = cached
+        response = get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+        ) or Response(data)
+        for header, value in headers.items():
+            response[header] = value
+        return response
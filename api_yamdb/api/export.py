@@ -0,0 +1,97 @@
+import csv
+import datetime
+
+from rest_framework.utils import encoders
+
+from reviews.models import Comment, Review
+
+from .renderers import FastJSONRenderer
+
+CHUNK_SIZE = 2000
+OUTPUT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+EXPORTS = {
+    'reviews': (Review, 'title', (
+        ('id', 'id'),
+        ('title_id', 'title'),
+        ('author__username', 'author'),
+        ('text', 'text'),
+        ('score', 'score'),
+        ('pub_date', 'pub_date'),
+        ('updated_at', 'updated_at'),
+    )),
+    'comments': (Comment, 'review__title', (
+        ('id', 'id'),
+        ('review__title_id', 'title'),
+        ('review_id', 'review'),
+        ('author__username', 'author'),
+        ('text', 'text'),
+        ('pub_date', 'pub_date'),
+        ('updated_at', 'updated_at'),
+    )),
+}
+
+
+def export_rows(resource, title=None, category=None, since=None,
+                until=None, chunk_size=CHUNK_SIZE):
+    model, title_path, columns = EXPORTS[resource]
+    queryset = model.objects.all()
+    if title is not None:
+        queryset = queryset.filter(**{f'{title_path}_id': title})
+    if category is not None:
+        queryset = queryset.filter(
+            **{f'{title_path}__category__slug': category})
+    if since is not None:
+        queryset = queryset.filter(pub_date__gte=since)
+    if until is not None:
+        queryset = queryset.filter(pub_date__lt=until)
+    return queryset.order_by('id').values_list(
+        *(column for column, _ in columns)
+    ).iterator(chunk_size=chunk_size)
+
+
+def get_field_names(resource):
+    return [name for _, name in EXPORTS[resource][2]]
+
+
+class Echo:
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(names, rows, chunk_size=CHUNK_SIZE):
+    render = FastJSONRenderer().render
+    buffer = []
+    for row in rows:
+        buffer.append(render(dict(zip(names, row))))
+        if len(buffer) >= chunk_size:
+            yield b'\n'.join(buffer) + b'\n'
+            buffer = []
+    if buffer:
+        yield b'\n'.join(buffer) + b'\n'
+
+
+def csv_lines(names, rows, chunk_size=CHUNK_SIZE):
+    default = encoders.JSONEncoder().default
+    writer = csv.writer(Echo())
+    yield writer.writerow(names).encode('utf-8')
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow([
+            default(value) if isinstance(value, datetime.datetime) else value
+            for value in row
+        ]))
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def export_lines(resource, output, chunk_size=CHUNK_SIZE, **filters):
+    rows = export_rows(resource, chunk_size=chunk_size, **filters)
+    lines = ndjson_lines if output == 'ndjson' else csv_lines
+    return lines(get_field_names(resource), rows, chunk_size)
@@ -0,0 +1,62 @@
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+UNKNOWN_SLUGS = 'Объекты со slug {slugs} не существуют.'
+
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_values(list(data))
+
+
+class BatchedSlugRelatedField(serializers.SlugRelatedField):
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def get_slug_cache(self):
+        caches = self.root.__dict__.setdefault('_slug_cache', {})
+        key = (self.get_queryset().model._meta.label, self.slug_field)
+        return caches.setdefault(key, {})
+
+    def resolve(self, slugs):
+        cache = self.get_slug_cache()
+        missing = {slug for slug in slugs if slug not in cache}
+        if missing:
+            found = self.get_queryset().filter(
+                **{f'{self.slug_field}__in': missing})
+            for obj in found:
+                cache[str(getattr(obj, self.slug_field))] = obj
+            for slug in missing:
+                cache.setdefault(slug, None)
+        return {slug: cache[slug] for slug in slugs
+                if cache[slug] is not None}
+
+    def to_internal_values(self, data):
+        if not all(isinstance(slug, str) for slug in data):
+            self.fail('invalid')
+        found = self.resolve(data)
+        missing = [slug for slug in data if slug not in found]
+        if missing:
+            raise serializers.ValidationError(
+                UNKNOWN_SLUGS.format(slugs=', '.join(missing)))
+        return [found[slug] for slug in data]
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        found = self.resolve([data])
+        if data not in found:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return found[data]
@@ -0,0 +1,75 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+DEFAULT_PAGE_SIZES = (10, 100, 1000)
+
+
+@contextmanager
+def benchmark_database(test_name=None):
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST']['NAME']
+    if test_name is not None:
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+
+
+def fill_database(size):
+    Category.objects.bulk_create(
+        Category(name=f'Категория {number}', slug=f'category-{number}')
+        for number in range(5))
+    categories = list(Category.objects.all())
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+        for number in range(10))
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=2000,
+              description='Описание произведения ' * 10,
+              category=categories[number % len(categories)])
+        for number in range(size))
+    titles = list(Title.objects.all())
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.id, genre_id=genre.id)
+        for number, title in enumerate(titles)
+        for genre in genres[number % 7:number % 7 + 3])
+    User.objects.bulk_create(
+        User(username=f'user{number}', email=f'user{number}@yamdb.fake')
+        for number in range(size))
+    users = list(User.objects.all())
+    Review.objects.bulk_create(
+        Review(title=titles[0], author=user, text='Текст отзыва ' * 10,
+               score=number % 10 + 1)
+        for number, user in enumerate(users))
+    review = Review.objects.first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=users[number % len(users)],
+                text='Текст комментария ' * 5)
+        for number in range(size))
+    Title.objects.rebuild_ratings()
+    return titles[0], review
+
+
+def get_request(path='/'):
+    return Request(APIRequestFactory().get(path))
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.serializers import ReviewSerializer
+from reviews.models import Review
+
+from ._benchmark import (DEFAULT_PAGE_SIZES, benchmark_database,
+                         fill_database, get_request, measure)
+
+
+class AsciiJSONRenderer(JSONRenderer):
+    ensure_ascii = True
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает размер и время кодирования страницы отзывов '
+            'разными JSON-рендерерами.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=DEFAULT_PAGE_SIZES,
+            help='Размеры страниц.')
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Количество повторов каждого замера.')
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson не установлен, FastJSONRenderer использует json.'))
+        candidates = (
+            ('ascii', AsciiJSONRenderer()),
+            ('json', JSONRenderer()),
+            ('fast', renderers.FastJSONRenderer()),
+        )
+        with benchmark_database():
+            title, _ = fill_database(max(options['sizes']))
+            queryset = Review.objects.filter(
+                title=title).select_related('author')
+            context = {'request': get_request()}
+            for size in options['sizes']:
+                data = ReviewSerializer(
+                    queryset[:size], many=True, context=context).data
+                for name, renderer in candidates:
+                    elapsed = measure(
+                        lambda: renderer.render(data), options['repeat'])
+                    self.stdout.write(
+                        f'{size:>5} {name:<6} '
+                        f'{len(renderer.render(data)):>9} байт  '
+                        f'{elapsed * 1000:8.3f} мс')
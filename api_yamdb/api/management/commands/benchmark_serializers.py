@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleReadSerializer)
+from api.values import ValuesSerializer
+from reviews.models import Comment, Review, Title
+
+from ._benchmark import (DEFAULT_PAGE_SIZES, benchmark_database,
+                         fill_database, get_request, measure)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время сериализации страницы списка через '
+            'сериализаторы DRF и через строки .values().')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=DEFAULT_PAGE_SIZES,
+            help='Размеры страниц.')
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Количество повторов каждого замера.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            title, review = fill_database(max(options['sizes']))
+            cases = (
+                ('titles', TitleReadSerializer, Title.objects.select_related(
+                    'category').prefetch_related('genre').order_by('id')),
+                ('reviews', ReviewSerializer, Review.objects.filter(
+                    title=title).select_related('author')),
+                ('comments', CommentSerializer, Comment.objects.filter(
+                    review=review).select_related('author')),
+            )
+            for name, serializer_class, queryset in cases:
+                for size in options['sizes']:
+                    self.compare(name, serializer_class, queryset, size,
+                                 options['repeat'])
+
+    def compare(self, name, serializer_class, queryset, size, repeat):
+        context = {'request': get_request()}
+        values = ValuesSerializer(serializer_class(context=context))
+        rows = queryset.prefetch_related(None).values(*values.columns)
+
+        def serializer_page():
+            return serializer_class(
+                list(queryset[:size]), many=True, context=context).data
+
+        def values_page():
+            return values.serialize(list(rows[:size]))
+
+        if serializer_page() != values_page():
+            self.stderr.write(f'{name}: ответы путей различаются.')
+        slow = measure(serializer_page, repeat)
+        fast = measure(values_page, repeat)
+        self.stdout.write(
+            f'{name:<9} {size:>5}  serializer {slow * 1000:8.2f} мс  '
+            f'values {fast * 1000:8.2f} мс  x{slow / max(fast, 1e-9):.1f}')
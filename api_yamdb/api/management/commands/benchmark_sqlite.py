@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from itertools import count
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from rest_framework.test import APIClient
+
+from reviews.models import Title, User
+
+from ._benchmark import benchmark_database, fill_database
+
+
+class Command(BaseCommand):
+    help = ('Нагружает SQLite параллельными записями отзывов и чтением '
+            'списков отзывов, печатает пропускную способность и число '
+            'ошибок блокировки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--writers', type=int, default=4,
+            help='Количество потоков, публикующих отзывы.')
+        parser.add_argument(
+            '--readers', type=int, default=4,
+            help='Количество потоков, читающих отзывы.')
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help='Длительность замера, в секундах.')
+        parser.add_argument(
+            '--titles', type=int, default=1000,
+            help='Количество произведений в тестовой базе.')
+        parser.add_argument(
+            '--plain', action='store_true',
+            help='Отключить PRAGMAS и TRANSACTION_MODE для сравнения.')
+
+    def handle(self, *args, **options):
+        saved = {
+            key: connection.settings_dict.get(key)
+            for key in ('PRAGMAS', 'TRANSACTION_MODE')
+        }
+        if options['plain']:
+            connection.settings_dict.update(
+                PRAGMAS={}, TRANSACTION_MODE=None)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                with benchmark_database(os.path.join(directory, 'bench.db')):
+                    fill_database(max(options['titles'], options['writers']))
+                    self.run_load(options)
+        finally:
+            connection.settings_dict.update(saved)
+
+    def run_load(self, options):
+        titles = list(Title.objects.values_list('id', flat=True))
+        users = list(User.objects.all()[:options['writers']])
+        connection.close()
+        stats = Counter()
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+        threads = [
+            threading.Thread(target=self.writer, args=(
+                user, titles[1:], deadline, stats, lock))
+            for user in users
+        ] + [
+            threading.Thread(target=self.reader, args=(
+                titles, number, deadline, stats, lock))
+            for number in range(options['readers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        duration = options['duration']
+        self.stdout.write(
+            f'Запись: {stats["writes"] / duration:.1f} отзывов/с, '
+            f'чтение: {stats["reads"] / duration:.1f} страниц/с, '
+            f'ошибок блокировки: {stats["locked"]}, '
+            f'прочих ошибок: {stats["errors"]}.')
+
+    def count(self, stats, lock, name):
+        with lock:
+            stats[name] += 1
+
+    def request(self, send, stats, lock, name):
+        try:
+            response = send()
+        except OperationalError as error:
+            locked = 'locked' in str(error)
+            self.count(stats, lock, 'locked' if locked else 'errors')
+            return
+        ok = response.status_code in (200, 201)
+        self.count(stats, lock, name if ok else 'errors')
+
+    def writer(self, user, titles, deadline, stats, lock):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            for title_id in titles:
+                if time.monotonic() > deadline:
+                    break
+                self.request(lambda: client.post(
+                    f'/api/v1/titles/{title_id}/reviews/',
+                    data={'text': 'Отзыв под нагрузкой', 'score': 5},
+                    format='json',
+                ), stats, lock, 'writes')
+        finally:
+            connection.close()
+
+    def reader(self, titles, number, deadline, stats, lock):
+        client = APIClient()
+        try:
+            for step in count(number):
+                if time.monotonic() > deadline:
+                    break
+                title_id = titles[step % len(titles)]
+                self.request(lambda: client.get(
+                    f'/api/v1/titles/{title_id}/reviews/'
+                ), stats, lock, 'reads')
+        finally:
+            connection.close()
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import CHUNK_SIZE, EXPORTS, OUTPUT_FORMATS, export_lines
+from api.serializers import ExportSerializer
+
+
+class Command(BaseCommand):
+    help = 'Выгружает отзывы или комментарии в формате NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=tuple(EXPORTS))
+        parser.add_argument(
+            '--output', choices=tuple(OUTPUT_FORMATS), default='ndjson',
+            help='Формат выгрузки.')
+        parser.add_argument('--title', help='id произведения.')
+        parser.add_argument('--category', help='slug категории.')
+        parser.add_argument(
+            '--since', help='Начало периода публикации (ISO 8601).')
+        parser.add_argument(
+            '--until', help='Конец периода публикации (ISO 8601).')
+        parser.add_argument(
+            '--file', help='Файл для выгрузки. По умолчанию stdout.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз.')
+
+    def handle(self, *args, **options):
+        serializer = ExportSerializer(data={
+            name: options[name]
+            for name in ('output', 'title', 'category', 'since', 'until')
+            if options[name] is not None
+        })
+        if not serializer.is_valid():
+            raise CommandError(serializer.errors)
+        params = dict(serializer.validated_data)
+        lines = export_lines(
+            options['resource'], params.pop('output'),
+            chunk_size=options['chunk_size'], **params)
+        if options['file'] is None:
+            for chunk in lines:
+                self.stdout.write(chunk.decode('utf-8'), ending='')
+            return
+        with open(options['file'], 'wb') as export_file:
+            for chunk in lines:
+                export_file.write(chunk)
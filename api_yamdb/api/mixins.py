@@ -1,8 +1,245 @@
-from rest_framework import mixins, viewsets
+import hashlib
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Count, Max
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework import generics, mixins, status, viewsets
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
 
-class CustomViewSet(mixins.CreateModelMixin,
+from api_yamdb.timing import timed
+from reviews.models import Review, Title
+
+from .cache import bump_model_version, get_version
+from .serializers import FIELDS_PARAM, OMIT_PARAM
+from .values import UnsupportedField, ValuesSerializer
+
+
+class BulkCreateMixin:
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        bump_model_version(serializer.child.Meta.model)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class TimedAPIView(generics.GenericAPIView):
+    # Общая основа представлений: этапы обработки запроса попадают
+    # в Server-Timing, а валидация замеряется у сериализатора,
+    # полученного через get_serializer.
+
+    def perform_authentication(self, request):
+        with timed('auth'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with timed('perm'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timed('perm'):
+            super().check_object_permissions(request, obj)
+
+    def check_throttles(self, request):
+        with timed('throttle'):
+            super().check_throttles(request)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        is_valid = serializer.is_valid
+
+        def timed_is_valid(*args, **kwargs):
+            with timed('validation'):
+                return is_valid(*args, **kwargs)
+
+        serializer.is_valid = timed_is_valid
+        return serializer
+
+
+class TimedViewSet(viewsets.ViewSetMixin, TimedAPIView):
+    pass
+
+
+class TimedModelViewSet(mixins.CreateModelMixin,
+                        mixins.RetrieveModelMixin,
+                        mixins.UpdateModelMixin,
+                        mixins.DestroyModelMixin,
+                        mixins.ListModelMixin,
+                        TimedViewSet):
+    pass
+
+
+class CustomViewSet(BulkCreateMixin,
+                    mixins.CreateModelMixin,
                     mixins.ListModelMixin,
                     mixins.DestroyModelMixin,
-                    viewsets.GenericViewSet):
+                    TimedViewSet):
     pass
+
+
+class ConditionalGetMixin:
+    last_modified_field = 'updated_at'
+    # Версия ресурса каталога входит в ETag: вложенные категории и жанры
+    # меняются, не затрагивая саму запись.
+    conditional_resource = None
+
+    def get_etag(self, *parts):
+        if self.conditional_resource is not None:
+            parts += (get_version(self.conditional_resource),)
+        value = ':'.join(str(part) for part in (
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            *parts,
+        ))
+        return quote_etag(hashlib.md5(value.encode('utf-8')).hexdigest())
+
+    def conditional_response(self, response_factory, etag, last_modified):
+        timestamp = None
+        if last_modified is not None:
+            timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = response_factory()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        state = self.filter_queryset(self.get_queryset()).aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count('pk'),
+        )
+        # Max(updated_at) не меняется при удалении строк, поэтому список
+        # проверяется только по ETag, без Last-Modified.
+        return self.conditional_response(
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs),
+            self.get_etag(state['count'], state['last_modified']),
+            None,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        return self.conditional_response(
+            lambda: Response(self.get_serializer(instance).data),
+            self.get_etag(instance.pk, last_modified),
+            last_modified if self.conditional_resource is None else None,
+        )
+
+
+def get_cursor_ordering(view):
+    cursor_class = getattr(view.paginator, 'cursor_pagination_class', None)
+    if cursor_class is None:
+        return ()
+    return cursor_class.ordering
+
+
+class NestedParentMixin:
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, id=self.kwargs.get('title_id'))
+        return self._title
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                id=self.kwargs.get('review_id'),
+                title_id=self.kwargs.get('title_id'),
+            )
+            self._title = self._review.title
+        return self._review
+
+
+class SparseFieldsetMixin:
+    sparse_required_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        params = self.request.query_params
+        if FIELDS_PARAM not in params and OMIT_PARAM not in params:
+            return queryset
+        sources = self.get_sparse_sources()
+        if sources is None:
+            return queryset
+        return self.restrict_queryset(queryset, sources)
+
+    def get_sparse_sources(self):
+        sources = set(self.sparse_required_fields)
+        sources.update(get_cursor_ordering(self))
+        last_modified = getattr(self, 'last_modified_field', None)
+        if last_modified:
+            sources.add(last_modified)
+        for field in self.get_serializer().fields.values():
+            if field.write_only:
+                continue
+            if field.source == '*':
+                return None
+            sources.add(field.source_attrs[0])
+        return sources
+
+    def restrict_queryset(self, queryset, sources):
+        opts = queryset.model._meta
+        columns = {opts.pk.name}
+        relations = set()
+        for name in sources:
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation:
+                relations.add(name)
+            if field.concrete and not field.many_to_many:
+                columns.add(name)
+
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            queryset = queryset.select_related(None).select_related(*(
+                name for name in select_related if name in relations))
+        prefetches = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, 'prefetch_through', lookup).split('__')[0]
+            in relations
+        ]
+        return queryset.prefetch_related(None).prefetch_related(
+            *prefetches).only(*columns)
+
+
+class ValuesListMixin:
+    values_list_enabled = True
+
+    def get_values_serializer(self):
+        if not self.values_list_enabled:
+            return None
+        try:
+            return ValuesSerializer(
+                self.get_serializer(), required=get_cursor_ordering(self))
+        except UnsupportedField:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        if serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(*serializer.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(list(rows)))
@@ -0,0 +1,139 @@
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+INVALID_CURSOR = 'Неверный курсор.'
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        position, self.reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(f'-{field}' for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        page = list(queryset[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if self.reverse:
+            page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if page:
+            self.first_position = self.get_position(page[0])
+            self.last_position = self.get_position(page[-1])
+        else:
+            self.first_position = self.last_position = position
+        return page
+
+    def get_position_filter(self, position):
+        lookup = 'lt' if self.reverse else 'gt'
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            exact = dict(zip(self.ordering[:index], position[:index]))
+            condition |= Q(**exact, **{f'{field}__{lookup}': position[index]})
+        return condition
+
+    def get_position(self, item):
+        position = []
+        for field in self.ordering:
+            if isinstance(item, dict):
+                value = item[field]
+            else:
+                value = getattr(item, field)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = cursor['p']
+            reverse = bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(INVALID_CURSOR)
+        if not isinstance(position, list) or (
+                len(position) != len(self.ordering)):
+            raise NotFound(INVALID_CURSOR)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps({'p': position, 'r': int(reverse)})
+        encoded = base64.urlsafe_b64encode(cursor.encode('utf-8'))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class TitleCursorPagination(KeysetPagination):
+    ordering = ('id',)
+
+
+class PubDateCursorPagination(KeysetPagination):
+    ordering = ('pub_date', 'id')
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    cursor_pagination_class = KeysetPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return self.cursor_paginator.get_paginated_response(data)
+
+
+class TitlePagination(OptionalCursorPagination):
+    cursor_pagination_class = TitleCursorPagination
+
+
+class PubDatePagination(OptionalCursorPagination):
+    cursor_pagination_class = PubDateCursorPagination
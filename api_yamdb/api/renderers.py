@@ -0,0 +1,54 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATORS = (
+    ('\u2028'.encode('utf-8'), b'\\u2028'),
+    ('\u2029'.encode('utf-8'), b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    default = encoders.JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(
+                accepted_media_type or '', renderer_context or {}):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        # Даты сериализует JSONEncoder DRF, чтобы формат не менялся.
+        ret = orjson.dumps(
+            data, default=self.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
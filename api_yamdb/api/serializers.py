@@ -1,8 +1,15 @@
+from collections import OrderedDict
+
+from django.db.models import Max
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
 from reviews.validators import username_not_me
+from .export import OUTPUT_FORMATS
+from .fields import BatchedManyRelatedField, BatchedSlugRelatedField
 from .title import CurrentReviewDefault, CurrentTitleDefault
 
 ERROR_CHANGE_ROLE = {
@@ -11,9 +18,170 @@ ERROR_CHANGE_ROLE = {
 ERROR_CHANGE_EMAIL = {
     'email': 'Невозможно изменить подтвержденный адрес электронной почты.'
 }
+UNIQUE_ERROR = 'Объект с таким значением поля {field} уже существует.'
+UNKNOWN_FIELDS = 'Неизвестные поля: {fields}.'
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_field_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def bulk_create_with_ids(model, objects, batch_size=None):
+    model.objects.bulk_create(objects, batch_size=batch_size)
+    if objects and objects[0].pk is None:
+        # Без RETURNING (SQLite) id не возвращаются. Строки вставлены
+        # подряд внутри одной пишущей транзакции, поэтому занимают
+        # последние id таблицы.
+        last_id = model.objects.aggregate(last_id=Max('pk'))['last_id']
+        first_id = last_id - len(objects) + 1
+        for pk, obj in enumerate(objects, start=first_id):
+            obj.pk = pk
+    for obj in objects:
+        obj._state.adding = False
+    return objects
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    batch_size = 1000
+
+    def pop_unique_validators(self):
+        unique = {}
+        for name, field in self.child.fields.items():
+            validators = [validator for validator in field.validators
+                          if isinstance(validator, UniqueValidator)]
+            if validators:
+                unique[name] = validators[0].queryset
+                field.validators = [validator for validator in field.validators
+                                    if validator not in validators]
+        return unique
+
+    def resolve_slugs(self, data):
+        if not isinstance(data, list):
+            return
+        for name, field in self.child.fields.items():
+            if isinstance(field, BatchedManyRelatedField):
+                field = field.child_relation
+            if not isinstance(field, BatchedSlugRelatedField):
+                continue
+            slugs = set()
+            for item in data:
+                value = item.get(name) if isinstance(item, dict) else None
+                if isinstance(value, str):
+                    slugs.add(value)
+                elif isinstance(value, list):
+                    slugs.update(slug for slug in value
+                                 if isinstance(slug, str))
+            field.resolve(slugs)
+
+    def check_unique(self, unique, data, errors):
+        for name, queryset in unique.items():
+            field = self.child.fields[name]
+            requested = {}
+            for index, item in enumerate(data):
+                if name in errors[index] or not isinstance(item, dict):
+                    continue
+                try:
+                    requested[index] = field.run_validation(
+                        item.get(name, empty))
+                except serializers.ValidationError:
+                    continue
+            existing = set(queryset.filter(
+                **{f'{field.source}__in': requested.values()}
+            ).values_list(field.source, flat=True))
+            seen = set()
+            for index, value in requested.items():
+                if value in existing or value in seen:
+                    errors[index][name] = [UNIQUE_ERROR.format(field=name)]
+                seen.add(value)
+
+    def to_internal_value(self, data):
+        unique = self.pop_unique_validators()
+        self.resolve_slugs(data)
+        # Уникальность проверяется и при ошибках в полях: клиент получает
+        # все ошибки каждого объекта сразу.
+        try:
+            values = super().to_internal_value(data)
+        except serializers.ValidationError as error:
+            if not isinstance(error.detail, list):
+                raise
+            values = None
+            errors = [dict(detail) for detail in error.detail]
+        else:
+            errors = [{} for _ in values]
+        self.check_unique(unique, data, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return values
 
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        many_to_many = [field.name for field in model._meta.many_to_many]
+        objects, relations = [], []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            # Повторы в списке нарушили бы уникальность связи в through.
+            relations.append({name: list(dict.fromkeys(attrs.pop(name)))
+                              for name in many_to_many if name in attrs})
+            objects.append(model(**attrs))
+        bulk_create_with_ids(model, objects, self.batch_size)
 
-class GetAllUserSerializer(serializers.ModelSerializer):
+        for name in many_to_many:
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+            through.objects.bulk_create([
+                through(**{source: obj.pk, target: related.pk})
+                for obj, related_objects in zip(objects, relations)
+                for related in related_objects.get(name, ())
+            ], batch_size=self.batch_size)
+            for obj, related_objects in zip(objects, relations):
+                prefetched = field.related_model.objects.none()
+                prefetched._result_cache = list(related_objects.get(name, ()))
+                prefetched._prefetch_done = True
+                obj._prefetched_objects_cache = {name: prefetched}
+        return objects
+
+
+class SparseFieldsMixin:
+
+    def is_top_level(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if (request is None or request.method not in SAFE_METHODS
+                or not self.is_top_level()):
+            return fields
+        include = parse_field_names(
+            request.query_params.get(FIELDS_PARAM, ''))
+        omit = parse_field_names(request.query_params.get(OMIT_PARAM, ''))
+        if not include and not omit:
+            return fields
+        readable = [
+            name for name, field in fields.items() if not field.write_only]
+        errors = {}
+        for param, names in ((FIELDS_PARAM, include), (OMIT_PARAM, omit)):
+            unknown = [name for name in names if name not in readable]
+            if unknown:
+                errors[param] = UNKNOWN_FIELDS.format(
+                    fields=', '.join(unknown))
+        if errors:
+            raise serializers.ValidationError(errors)
+        keep = set(include or readable) - set(omit)
+        return OrderedDict(
+            (name, field) for name, field in fields.items()
+            if name in keep or field.write_only
+        )
+
+
+class GetAllUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = User
@@ -67,6 +235,7 @@ class CategorySerializer(serializers.ModelSerializer):
         exclude = ('id', )
         model = Category
         lookup_field = 'slug'
+        list_serializer_class = BulkCreateListSerializer
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -74,28 +243,32 @@ class GenreSerializer(serializers.ModelSerializer):
         exclude = ('id', )
         model = Genre
         lookup_field = 'slug'
+        list_serializer_class = BulkCreateListSerializer
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
     rating = serializers.IntegerField(read_only=True, required=False)
 
     class Meta:
-        fields = '__all__'
+        exclude = ('score_sum', 'review_count', 'updated_at')
         model = Title
 
 
 class TitleWriteSerializer(TitleReadSerializer):
-    genre = serializers.SlugRelatedField(queryset=Genre.objects.all(),
-                                         slug_field='slug',
-                                         many=True)
-    category = serializers.SlugRelatedField(queryset=Category.objects.all(),
-                                            slug_field='slug',
-                                            )
+    genre = BatchedSlugRelatedField(queryset=Genre.objects.all(),
+                                    slug_field='slug',
+                                    many=True)
+    category = BatchedSlugRelatedField(queryset=Category.objects.all(),
+                                       slug_field='slug',
+                                       )
+
+    class Meta(TitleReadSerializer.Meta):
+        list_serializer_class = BulkCreateListSerializer
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     title = serializers.HiddenField(default=CurrentTitleDefault())
     author = serializers.SlugRelatedField(
         default=serializers.CurrentUserDefault(),
@@ -104,14 +277,14 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at',)
         model = Review
         validators = (UniqueTogetherValidator(
             queryset=Review.objects.all(),
             fields=('title', 'author',)),)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     review = serializers.HiddenField(
         default=CurrentReviewDefault(), )
     author = serializers.SlugRelatedField(
@@ -119,5 +292,14 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = '__all__'
+        exclude = ('updated_at',)
         extra_kwargs = {'text': {'required': True}}
+
+
+class ExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=tuple(OUTPUT_FORMATS), default='ndjson')
+    title = serializers.IntegerField(required=False)
+    category = serializers.SlugField(required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title, User
+from .authentication import renew_user_version
+from .cache import bump_model_version, bump_version
+
+
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Genre)
+@receiver((post_save, post_delete), sender=Title)
+def bump_catalog_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_genres_version(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version('titles')
+
+
+@receiver(post_save, sender=Review)
+def bump_rating_version(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_score', None)
+    if previous != (instance.title_id, instance.score):
+        bump_version('titles')
+
+
+@receiver(post_delete, sender=Review)
+def bump_deleted_rating_version(sender, **kwargs):
+    bump_version('titles')
+
+
+@receiver((post_save, post_delete), sender=User)
+def renew_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: renew_user_version(user_id))
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class TokenBucketStore:
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_rate, amount=1):
+        # При amount=0 корзина только проверяется, жетон не списывается.
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= 1:
+                tokens -= amount
+                wait = 0
+            else:
+                wait = (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+bucket_store = TokenBucketStore(settings.THROTTLE_BUCKETS_SIZE)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope_suffix = None
+    failures_only = False
+
+    def get_rate(self, view):
+        scope = f'{view.throttle_scope}_{self.scope_suffix}'
+        try:
+            return scope, api_settings.DEFAULT_THROTTLE_RATES[scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f'Не задана частота запросов для области {scope}.')
+
+    def get_key(self, request):
+        raise NotImplementedError
+
+    def consume(self, request, view, amount):
+        scope, rate = self.get_rate(view)
+        key = self.get_key(request)
+        if rate is None or key is None:
+            return 0
+        num, duration = parse_rate(rate)
+        return bucket_store.consume(
+            f'{scope}:{key}', num, num / duration, amount)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = self.consume(
+            request, view, 0 if self.failures_only else 1)
+        return self.wait_seconds == 0
+
+    def record_failure(self, request, view):
+        if self.failures_only:
+            self.consume(request, view, 1)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPBucketThrottle(TokenBucketThrottle):
+    scope_suffix = 'ip'
+
+    def get_key(self, request):
+        # X-Forwarded-For задаёт клиент, поэтому ключом служит только адрес
+        # соединения; за прокси его должен подставлять сам прокси.
+        return request.META.get('REMOTE_ADDR')
+
+
+class UsernameBucketThrottle(TokenBucketThrottle):
+    scope_suffix = 'username'
+
+    def get_key(self, request):
+        if not isinstance(request.data, dict):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return username.lower()
+
+
+class FailedUsernameBucketThrottle(UsernameBucketThrottle):
+    # Жетоны списывают только неудачные попытки, поэтому верный код
+    # проходит, сколько бы раз его ни отправляли. Злоумышленник всё ещё
+    # может перебором чужого имени временно закрыть владельцу вход, но
+    # без этого ограничения код подтверждения можно было бы подобрать.
+    failures_only = True
@@ -1,9 +1,9 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    GetAllUserViewSet, GetTokenView, RegistrationView,
-                    ReviewViewSet, TitleViewSet)
+from .views import (CategoryViewSet, CommentViewSet, ExportView,
+                    GenreViewSet, GetAllUserViewSet, GetTokenView,
+                    RegistrationView, ReviewViewSet, TitleViewSet)
 
 appname = 'api'
 router = DefaultRouter()
@@ -11,7 +11,7 @@ router = DefaultRouter()
 router.register(r'categories', CategoryViewSet, basename='categories')
 router.register(r'genres', GenreViewSet, basename='genres')
 router.register(r'titles', TitleViewSet, basename='titles')
-router.register('users', GetAllUserViewSet)
+router.register('users', GetAllUserViewSet, basename='users')
 router.register(r'titles/(?P<title_id>\d+)/reviews',
                 ReviewViewSet, basename='reviews')
 router.register(
@@ -29,5 +29,17 @@ urlpatterns = [
         'v1/auth/token/',
         GetTokenView.as_view(),
         name='get_token'
-    )
+    ),
+    path(
+        'v1/export/reviews/',
+        ExportView.as_view(),
+        {'resource': 'reviews'},
+        name='export_reviews'
+    ),
+    path(
+        'v1/export/comments/',
+        ExportView.as_view(),
+        {'resource': 'comments'},
+        name='export_comments'
+    ),
 ]
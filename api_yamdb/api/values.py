@@ -0,0 +1,112 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+class ValuesSerializer:
+
+    def __init__(self, serializer, required=()):
+        self.model = serializer.Meta.model
+        self.pk = self.model._meta.pk.attname
+        self.columns = {self.pk, *required}
+        self.prefetches = []
+        self.getters = self.compile_fields(serializer, prefix='')
+
+    def compile_fields(self, serializer, prefix):
+        return [
+            (name, self.compile(field, prefix))
+            for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+
+    def compile(self, field, prefix):
+        if field.source == '*' or '.' in field.source:
+            raise UnsupportedField(field.field_name)
+        column = prefix + field.source
+
+        if isinstance(field, serializers.ListSerializer):
+            if prefix:
+                raise UnsupportedField(field.field_name)
+            return self.compile_many(field)
+        if isinstance(field, serializers.ModelSerializer):
+            return self.compile_nested(field, column)
+        column = self.get_column(field, column)
+        self.columns.add(column)
+        return self.compile_value(field, column)
+
+    def compile_nested(self, field, column):
+        getters = self.compile_fields(field, prefix=f'{column}__')
+        self.columns.add(column)
+
+        def nested(row):
+            if row[column] is None:
+                return None
+            return {name: getter(row) for name, getter in getters}
+        return nested
+
+    def get_column(self, field, column):
+        if isinstance(field, serializers.SlugRelatedField):
+            return f'{column}__{field.slug_field}'
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None:
+                raise UnsupportedField(field.field_name)
+        elif isinstance(field, (serializers.RelatedField,
+                                serializers.ManyRelatedField,
+                                serializers.Serializer)):
+            raise UnsupportedField(field.field_name)
+        return column
+
+    def compile_value(self, field, column):
+        if isinstance(field, (serializers.RelatedField, *PLAIN_FIELDS)):
+            return lambda row: row[column]
+        to_representation = field.to_representation
+
+        def converted(row):
+            value = row[column]
+            return None if value is None else to_representation(value)
+        return converted
+
+    def compile_many(self, field):
+        relation = self.model._meta.get_field(field.source)
+        if not relation.many_to_many or not isinstance(
+                field.child, serializers.ModelSerializer):
+            raise UnsupportedField(field.field_name)
+        child = ValuesSerializer(field.child)
+        if child.prefetches:
+            raise UnsupportedField(field.field_name)
+        lookup = relation.related_query_name()
+        groups = {}
+        self.prefetches.append((relation, lookup, child, groups))
+        return lambda row: groups.get(row[self.pk], [])
+
+    def prefetch(self, rows):
+        ids = [row[self.pk] for row in rows]
+        for relation, lookup, child, groups in self.prefetches:
+            groups.clear()
+            if not ids:
+                continue
+            related = relation.related_model._default_manager.filter(
+                **{f'{lookup}__in': ids}
+            ).values(lookup, *child.columns)
+            grouped = defaultdict(list)
+            for row in related:
+                grouped[row[lookup]].append(child.serialize_row(row))
+            groups.update(grouped)
+
+    def serialize_row(self, row):
+        return {name: getter(row) for name, getter in self.getters}
+
+    def serialize(self, rows):
+        self.prefetch(rows)
+        return [self.serialize_row(row) for row in rows]
@@ -1,9 +1,8 @@
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models.aggregates import Avg
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, views, viewsets
+from rest_framework import filters, status
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
@@ -11,15 +10,23 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import (Category, Genre, OutboxEmail, Title,
+                            TitleScoreHistogram, User)
+from .cache import CachedListMixin
+from .export import OUTPUT_FORMATS, export_lines
 from .filters import TitleFilter
-from .mixins import CustomViewSet
+from .mixins import (BulkCreateMixin, ConditionalGetMixin, CustomViewSet,
+                     NestedParentMixin, SparseFieldsetMixin, TimedAPIView,
+                     TimedModelViewSet, ValuesListMixin)
+from .pagination import PubDatePagination, TitlePagination
 from .permissions import IsAdmin, ReviewCommentPermissions, AdminOrReadOnly
 from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, GetAllUserSerializer,
-                          GetTokenSerializer, RegistrationSerializer,
-                          ReviewSerializer, TitleReadSerializer,
-                          TitleWriteSerializer)
+                          ExportSerializer, GenreSerializer,
+                          GetAllUserSerializer, GetTokenSerializer,
+                          RegistrationSerializer, ReviewSerializer,
+                          TitleReadSerializer, TitleWriteSerializer)
+from .throttling import (FailedUsernameBucketThrottle, IPBucketThrottle,
+                         UsernameBucketThrottle)
 
 USER_ERROR = {
     'Ошибка': 'Данный email уже зарегистирован.'
@@ -43,7 +50,7 @@ ME_ERROR = {
 }
 
 
-class GetAllUserViewSet(viewsets.ModelViewSet):
+class GetAllUserViewSet(SparseFieldsetMixin, TimedModelViewSet):
     permission_classes = [IsAdmin]
     queryset = User.objects.all()
     serializer_class = GetAllUserSerializer
@@ -77,22 +84,24 @@ class GetAllUserViewSet(viewsets.ModelViewSet):
         return Response(status=status.HTTP_403_FORBIDDEN)
 
 
-class RegistrationView(views.APIView):
+class RegistrationView(TimedAPIView):
+    serializer_class = RegistrationSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPBucketThrottle, UsernameBucketThrottle]
+    throttle_scope = 'signup'
 
     @staticmethod
     def send_reg_mail(email, user):
-        send_mail(
+        OutboxEmail.objects.create(
             subject='Код подтверждения для получения токена.',
             message=f'Пожалуйста, не передавайте данный код третьим лицам. '
                     f'Ваш код: {user.confirmation_code}',
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False
+            recipient=email,
         )
 
     def post(self, request):
-        serializer = RegistrationSerializer(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data['email']
         serializer.save(email=email)
@@ -101,11 +110,21 @@ class RegistrationView(views.APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class GetTokenView(views.APIView):
+class GetTokenView(TimedAPIView):
+    serializer_class = GetTokenSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [IPBucketThrottle, FailedUsernameBucketThrottle]
+    throttle_scope = 'token'
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if response.status_code in (status.HTTP_400_BAD_REQUEST,
+                                    status.HTTP_404_NOT_FOUND):
+            for throttle in self.get_throttles():
+                throttle.record_failure(request, self)
+        return super().finalize_response(request, response, *args, **kwargs)
 
     def post(self, request):
-        serializer = GetTokenSerializer(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         confirmation_code = serializer.validated_data['confirmation_code']
         username = serializer.validated_data['username']
@@ -132,7 +151,8 @@ class GetTokenView(views.APIView):
         }
 
 
-class CategoryViewSet(CustomViewSet):
+class CategoryViewSet(CachedListMixin, CustomViewSet):
+    cache_resource = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (AdminOrReadOnly,)
@@ -142,7 +162,8 @@ class CategoryViewSet(CustomViewSet):
     search_fields = ('name',)
 
 
-class GenreViewSet(CustomViewSet):
+class GenreViewSet(CachedListMixin, CustomViewSet):
+    cache_resource = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (AdminOrReadOnly,)
@@ -152,11 +173,14 @@ class GenreViewSet(CustomViewSet):
     search_fields = ('name',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).all()
+class TitleViewSet(BulkCreateMixin, CachedListMixin, ConditionalGetMixin,
+                   SparseFieldsetMixin, ValuesListMixin, TimedModelViewSet):
+    cache_resource = 'titles'
+    conditional_resource = 'titles'
+    queryset = Title.objects.select_related(
+        'category').prefetch_related('genre')
     permission_classes = (AdminOrReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = TitlePagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
@@ -165,32 +189,57 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleWriteSerializer
         return TitleReadSerializer
 
+    @action(detail=True, methods=['GET'])
+    def stats(self, request, pk=None):
+        try:
+            histogram = get_object_or_404(TitleScoreHistogram, title_id=pk)
+        except Http404:
+            histogram = TitleScoreHistogram(
+                title=get_object_or_404(Title, pk=pk))
+        return Response(histogram.get_stats())
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(NestedParentMixin, ConditionalGetMixin,
+                    SparseFieldsetMixin, ValuesListMixin, TimedModelViewSet):
     serializer_class = ReviewSerializer
+    sparse_required_fields = ('author',)
     permission_classes = [ReviewCommentPermissions, ]
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        new_queryset = title.reviews.all()
-        return new_queryset
+        return self.get_title().reviews.select_related('author')
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedParentMixin, ConditionalGetMixin,
+                     SparseFieldsetMixin, ValuesListMixin, TimedModelViewSet):
     serializer_class = CommentSerializer
+    sparse_required_fields = ('author',)
     permission_classes = [ReviewCommentPermissions, ]
-    pagination_class = PageNumberPagination
+    pagination_class = PubDatePagination
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        new_queryset = review.comments.all()
-        return new_queryset
+        return self.get_review().comments.select_related('author')
+
+
+class ExportView(TimedAPIView):
+    serializer_class = ExportSerializer
+    permission_classes = [IsAdmin]
+
+    def get(self, request, resource):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        output = params.pop('output')
+        response = StreamingHttpResponse(
+            export_lines(resource, output, **params),
+            content_type=OUTPUT_FORMATS[output],
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{output}"')
+        return response
@@ -1,7 +1,16 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+# В Django 2.2 нет ASGI-обработчика: запросы передаются WSGI-приложению
+# через пул потоков, а горячие анонимные чтения каталога отдаются из снимка.
+wsgi_application = get_wsgi_application()
+
+from .asgi_handlers import (CatalogSnapshotHandler,  # noqa: E402
+                            LifespanHandler, WSGIBridge)
+
+bridge = WSGIBridge(wsgi_application, settings.ASGI_THREADS)
+application = LifespanHandler(CatalogSnapshotHandler(bridge), bridge.shutdown)
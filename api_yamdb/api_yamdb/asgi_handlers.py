@@ -0,0 +1,293 @@
+import asyncio
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+
+from api.cache import get_version
+
+from .compression import choose_encoding
+from .metrics import record_request, record_response_size
+from .routers import replica_configured
+from .timing import RequestTimings, log_timings
+
+MAX_MEMORY_BODY = 1024 * 1024
+SNAPSHOT_ROUTES = (
+    (re.compile(r'^/api/v1/categories/$'), 'categories', 'list'),
+    (re.compile(r'^/api/v1/genres/$'), 'genres', 'list'),
+    (re.compile(r'^/api/v1/titles/\d+/$'), 'titles', 'retrieve'),
+)
+URL_NAMES = {'list': 'list', 'retrieve': 'detail'}
+
+
+def strip_weak(tag):
+    tag = tag.strip()
+    return tag[2:] if tag.startswith(b'W/') else tag
+
+
+def build_environ(scope, body):
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    client_host, client_port = scope.get('client') or ('', 0)
+    path = scope['path'].encode('utf-8').decode('latin-1')
+    root_path = scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path,
+        'PATH_INFO': path,
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'REMOTE_ADDR': client_host,
+        'REMOTE_PORT': str(client_port),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            key = name
+        else:
+            key = f'HTTP_{name}'
+        if key in environ:
+            value = f'{environ[key]},{value}'
+        environ[key] = value
+    if 'CONTENT_LENGTH' not in environ:
+        # Тело без Content-Length (chunked) уже прочитано целиком.
+        environ['CONTENT_LENGTH'] = str(body.seek(0, 2))
+        body.seek(0)
+    return environ
+
+
+async def read_body(receive):
+    body = SpooledTemporaryFile(max_size=MAX_MEMORY_BODY)
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        body.write(message.get('body', b''))
+        if not message.get('more_body', False):
+            break
+    body.seek(0)
+    return body
+
+
+class WSGIBridge:
+    # Запрос целиком, включая отдачу потокового ответа, выполняется в одном
+    # потоке пула: соединения с базой привязаны к потоку.
+
+    def __init__(self, wsgi_application, threads):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            threads, thread_name_prefix='asgi-wsgi')
+
+    async def __call__(self, scope, receive, send):
+        body = await read_body(receive)
+        loop = asyncio.get_running_loop()
+
+        def call(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        try:
+            await loop.run_in_executor(
+                self.executor, self.run, build_environ(scope, body), call)
+        finally:
+            body.close()
+
+    def run(self, environ, call):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        def start():
+            call({
+                'type': 'http.response.start',
+                'status': response['status'],
+                'headers': response['headers'],
+            })
+
+        result = self.wsgi_application(environ, start_response)
+        try:
+            started = False
+            for chunk in result:
+                if not started:
+                    start()
+                    started = True
+                if chunk:
+                    call({'type': 'http.response.body', 'body': chunk,
+                          'more_body': True})
+            if not started:
+                start()
+            call({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+class SnapshotStore:
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, snapshot = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def set(self, key, snapshot, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+snapshot_store = SnapshotStore(
+    settings.ASGI_SNAPSHOT_SIZE, settings.CATALOG_CACHE_TIMEOUT)
+
+
+class CatalogSnapshotHandler:
+
+    def __init__(self, application, store=snapshot_store):
+        self.application = application
+        self.store = store
+
+    def get_timeout(self):
+        # Анонимные чтения идут в реплику: как и кеш каталога, снимок
+        # не должен закреплять её отстающие строки дольше окна задержки.
+        if replica_configured():
+            return settings.REPLICA_LAG
+        return self.store.ttl
+
+    def get_resource(self, scope, headers):
+        if scope['method'] != 'GET' or b'authorization' in headers:
+            return None
+        if settings.SESSION_COOKIE_NAME.encode() in headers.get(
+                b'cookie', b''):
+            return None
+        for pattern, resource, action in SNAPSHOT_ROUTES:
+            if pattern.match(scope['path']):
+                return resource, action
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.application(scope, receive, send)
+        started = time.perf_counter()
+        headers = dict(scope.get('headers', ()))
+        route = self.get_resource(scope, headers)
+        if route is None:
+            return await self.application(scope, receive, send)
+        resource, action = route
+
+        encoding = choose_encoding(
+            headers.get(b'accept-encoding', b'').decode('latin-1'))
+        key = (
+            resource, get_version(resource), scope['path'],
+            scope.get('query_string', b''), headers.get(b'accept', b''),
+            encoding,
+        )
+        snapshot = self.store.get(key)
+        if snapshot is None:
+            return await self.record(key, scope, receive, send)
+
+        status, response_headers, body = snapshot
+        etag = dict(response_headers).get(b'etag')
+        if_none_match = headers.get(b'if-none-match', b'')
+        if etag is not None and strip_weak(etag) in map(
+                strip_weak, if_none_match.split(b',')):
+            status, body = 304, b''
+            response_headers = [
+                (name, value) for name, value in response_headers
+                if name not in (b'content-length', b'content-type')]
+        duration = time.perf_counter() - started
+        record_request(resource, action, scope['method'], status, duration, 0)
+        record_response_size(resource, action, len(body))
+        if settings.SERVER_TIMING:
+            timings = RequestTimings()
+            timings.add('total', duration)
+            response_headers = [*response_headers, (
+                b'server-timing', f'snapshot, {timings.header()}'.encode())]
+            log_timings(
+                timings, method=scope['method'], path=scope['path'],
+                view=f'{resource}-{URL_NAMES[action]}', status=status,
+                snapshot=True)
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': response_headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def record(self, key, scope, receive, send):
+        response = {'body': []}
+
+        async def recording_send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = message.get('headers', [])
+            elif message['type'] == 'http.response.body':
+                response['body'].append(message.get('body', b''))
+            await send(message)
+
+        await self.application(scope, receive, recording_send)
+        if response.get('status') == 200:
+            # Server-Timing описывает только тот запрос, в котором получен.
+            headers = [(name, value) for name, value in response['headers']
+                       if name != b'server-timing']
+            self.store.set(key, (
+                response['status'], headers,
+                b''.join(response['body'])), self.get_timeout())
+
+
+class LifespanHandler:
+
+    def __init__(self, application, on_shutdown):
+        self.application = application
+        self.on_shutdown = on_shutdown
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'lifespan':
+            return await self.application(scope, receive, send)
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.on_shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
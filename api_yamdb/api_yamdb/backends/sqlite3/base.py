@@ -0,0 +1,37 @@
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+PRAGMA_NAME = re.compile(r'[a-z_]+')
+PRAGMA_VALUE = re.compile(r'-?\d+|[A-Za-z_]+')
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_pragmas(self):
+        pragmas = self.settings_dict.get('PRAGMAS') or {}
+        for name, value in pragmas.items():
+            if not PRAGMA_NAME.fullmatch(name) or not PRAGMA_VALUE.fullmatch(
+                    str(value)):
+                raise ImproperlyConfigured(
+                    f'Недопустимая настройка PRAGMA {name} = {value}.')
+        return pragmas
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.get_pragmas().items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        # BEGIN IMMEDIATE сразу берёт блокировку записи, поэтому транзакция
+        # ждёт busy_timeout, а не падает при повышении блокировки чтения.
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        if mode is None:
+            return super()._start_transaction_under_autocommit()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'Недопустимый режим транзакций {mode}.')
+        self.cursor().execute(f'BEGIN {mode}')
@@ -0,0 +1,101 @@
+import gzip
+import mimetypes
+import os
+
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+COMPRESSIBLE_TYPES = {
+    'application/javascript',
+    'application/json',
+    'application/x-ndjson',
+    'application/x-yaml',
+    'application/xml',
+    'application/yaml',
+    'image/svg+xml',
+}
+STATIC_TYPES = {
+    '.yaml': 'application/yaml',
+    '.yml': 'application/yaml',
+    '.json': 'application/json',
+    '.js': 'application/javascript',
+    '.css': 'text/css',
+    '.html': 'text/html',
+    '.svg': 'image/svg+xml',
+    '.txt': 'text/plain',
+}
+DYNAMIC_BROTLI_QUALITY = 4
+
+
+def get_encodings():
+    if brotli is None:
+        return ('gzip',)
+    return ('br', 'gzip')
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for item in header.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header, available=None):
+    if available is None:
+        available = get_encodings()
+    accepted = parse_accept_encoding(header or '')
+    for encoding in available:
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def is_compressible_type(content_type):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    return (content_type.startswith('text/')
+            or content_type in COMPRESSIBLE_TYPES)
+
+
+def guess_type(name):
+    content_type, _ = mimetypes.guess_type(name)
+    if content_type is None:
+        content_type = STATIC_TYPES.get(
+            os.path.splitext(name)[1].lower(), 'application/octet-stream')
+    return content_type
+
+
+def compress(data, encoding, static=False):
+    if encoding == 'br':
+        quality = 11 if static else DYNAMIC_BROTLI_QUALITY
+        return brotli.compress(data, quality=quality)
+    if static:
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return compress_string(data)
+
+
+def compress_stream(chunks, encoding):
+    if encoding == 'gzip':
+        yield from compress_sequence(chunks)
+        return
+    compressor = brotli.Compressor(quality=DYNAMIC_BROTLI_QUALITY)
+    for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
@@ -0,0 +1,295 @@
+import atexit
+import glob
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+METRICS = {
+    'yamdb_requests_total': (
+        'counter', 'Число обработанных запросов.', None),
+    'yamdb_request_duration_seconds': (
+        'histogram', 'Время обработки запроса.', LATENCY_BUCKETS),
+    'yamdb_response_size_bytes': (
+        'histogram', 'Размер ответа.', SIZE_BUCKETS),
+    'yamdb_db_queries': (
+        'histogram', 'Число запросов к базе данных за запрос.',
+        QUERY_BUCKETS),
+}
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+HOSTNAME = socket.gethostname()
+AGGREGATE_FILE = 'aggregate.json'
+LOCK_FILE = 'aggregate.lock'
+
+
+def merge(target, key, values):
+    current = target.get(key)
+    if current is None:
+        target[key] = list(values) if isinstance(values, list) else values
+    elif isinstance(current, list):
+        for index, value in enumerate(values):
+            current[index] += value
+    else:
+        target[key] = current + values
+
+
+class MetricsStore:
+    # Каждый поток пишет только в свой словарь, поэтому запись обходится
+    # без блокировок; при сборе словари потоков суммируются.
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._register_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flushed = 0
+        self._path = None
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._register_lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name, labels, amount=1):
+        shard = self.shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        shard = self.shard()
+        key = (name, labels)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * (len(buckets) + 2)
+        values[bisect_left(buckets, value)] += 1
+        values[-1] += value
+
+    def collect(self):
+        with self._register_lock:
+            shards = list(self._shards)
+        collected = {}
+        for shard in shards:
+            for key, values in list(shard.items()):
+                merge(collected, key, values)
+        return collected
+
+    def clear(self):
+        with self._register_lock:
+            self._shards = []
+            self._local = threading.local()
+
+    def reset_after_fork(self):
+        # Дочерний процесс не должен повторно отдавать значения родителя.
+        self.clear()
+        self._flush_lock = threading.Lock()
+        self._flushed = 0
+        self._path = None
+
+    def get_path(self, directory):
+        if self._path is None or os.path.dirname(self._path) != directory:
+            self._path = os.path.join(
+                directory,
+                f'{HOSTNAME}_{os.getpid()}_{uuid.uuid4().hex}.json')
+        return self._path
+
+    def flush(self, force=False):
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed < settings.METRICS_FLUSH_INTERVAL:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._flushed = now
+            write_json(self.get_path(directory), [
+                [name, labels, values]
+                for (name, labels), values in self.collect().items()
+            ])
+        finally:
+            self._flush_lock.release()
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_finished(name):
+    # По PID можно судить только о процессах своего узла: на другом узле
+    # или в другом пространстве имён тот же номер ничего не значит.
+    host, pid, _ = name[:-len('.json')].rsplit('_', 2)
+    return host == HOSTNAME and pid.isdigit() and not process_alive(int(pid))
+
+
+def parse_samples(data):
+    return [((name, tuple(tuple(label) for label in labels)), values)
+            for name, labels, values in data]
+
+
+def read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def merge_samples(target, samples):
+    for key, values in samples:
+        merge(target, key, values)
+
+
+def write_json(path, data):
+    with open(f'{path}.tmp', 'w') as file:
+        json.dump(data, file)
+    os.replace(f'{path}.tmp', path)
+
+
+@contextmanager
+def directory_lock(directory):
+    with open(os.path.join(directory, LOCK_FILE), 'a') as file:
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        yield
+
+
+def save_aggregate(directory, aggregated, folded):
+    write_json(os.path.join(directory, AGGREGATE_FILE), {
+        'folded': sorted(folded),
+        'samples': [[name, labels, values]
+                    for (name, labels), values in aggregated.items()],
+    })
+
+
+def read_aggregate(directory):
+    data = read_json(os.path.join(directory, AGGREGATE_FILE))
+    if data is None:
+        return {}, set()
+    aggregated = {}
+    merge_samples(aggregated, parse_samples(data['samples']))
+    return aggregated, set(data['folded'])
+
+
+def collect_directory(directory):
+    # Значения завершившихся процессов переносятся в общий файл, а не
+    # выбрасываются: иначе счётчики уменьшались бы и Prometheus принимал
+    # это за сброс. Имена перенесённых файлов запоминаются, чтобы файл,
+    # не удалённый из-за сбоя, не был учтён повторно.
+    with directory_lock(directory):
+        aggregated, folded = read_aggregate(directory)
+        collected = {}
+        paths = glob.glob(os.path.join(directory, '*_*_*.json'))
+        names = {os.path.basename(path): path for path in paths}
+        finished = {name for name in names if name not in folded
+                    and fcntl is not None and process_finished(name)}
+        for name, path in names.items():
+            if name in folded:
+                continue
+            data = read_json(path)
+            if data is None:
+                finished.discard(name)
+                continue
+            merge_samples(aggregated if name in finished else collected,
+                          parse_samples(data))
+        kept = folded & names.keys()
+        if finished or kept != folded:
+            save_aggregate(directory, aggregated, kept | finished)
+        for name in kept | finished:
+            try:
+                os.remove(names[name])
+            except OSError:
+                pass
+    for key, values in aggregated.items():
+        merge(collected, key, values)
+    return collected
+
+
+metrics_store = MetricsStore()
+os.register_at_fork(after_in_child=metrics_store.reset_after_fork)
+atexit.register(metrics_store.flush, force=True)
+
+
+def record_request(basename, action, method, status, duration, queries):
+    route = (('basename', basename), ('action', action))
+    metrics_store.inc('yamdb_requests_total', route + (
+        ('method', method), ('status', str(status))))
+    metrics_store.observe('yamdb_request_duration_seconds', route, duration)
+    metrics_store.observe('yamdb_db_queries', route, queries)
+    metrics_store.flush()
+
+
+def record_response_size(basename, action, size):
+    metrics_store.observe(
+        'yamdb_response_size_bytes',
+        (('basename', basename), ('action', action)), size)
+
+
+def collect():
+    if not settings.METRICS_DIR:
+        return metrics_store.collect()
+    metrics_store.flush(force=True)
+    return collect_directory(settings.METRICS_DIR)
+
+
+def escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def format_labels(labels, extra=()):
+    pairs = [f'{name}="{escape(value)}"' for name, value in labels + extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+def render(collected):
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        samples = sorted(
+            (labels, values) for (metric, labels), values in collected.items()
+            if metric == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, values in samples:
+            if kind == 'counter':
+                lines.append(f'{name}{format_labels(labels)} {values}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ('+Inf',), values[:-1]):
+                cumulative += count
+                bucket_labels = format_labels(labels, (('le', bound),))
+                lines.append(f'{name}_bucket{bucket_labels} {cumulative}')
+            labels = format_labels(labels)
+            lines.append(f'{name}_sum{labels} {format_value(values[-1])}')
+            lines.append(f'{name}_count{labels} {cumulative}')
+    return '\n'.join(lines) + '\n'
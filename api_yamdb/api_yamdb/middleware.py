@@ -0,0 +1,160 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import (choose_encoding, compress, compress_stream,
+                          is_compressible_type)
+from .metrics import record_request, record_response_size
+from .routers import (mark_recently_wrote, recently_wrote,
+                      replica_configured, replica_reads)
+from .timing import (RequestTimings, count_queries, log_timings,
+                     request_timings)
+
+API_PREFIX = '/api/'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class CompressionMiddleware(MiddlewareMixin):
+
+    def process_response(self, request, response):
+        if (response.has_header('Content-Encoding')
+                or not is_compressible_type(response.get('Content-Type'))):
+            return response
+        if (not response.streaming
+                and len(response.content) < settings.COMPRESSION_MIN_SIZE):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # Сжатое представление не совпадает побайтно с исходным.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+
+    def process_request(self, request):
+        request.replica_token = None
+        if not replica_configured() or not request.path.startswith(
+                API_PREFIX):
+            return
+        use_replica = (request.method in SAFE_METHODS
+                       and not recently_wrote(request))
+        request.replica_token = replica_reads.set(use_replica)
+
+    def process_response(self, request, response):
+        token = getattr(request, 'replica_token', None)
+        if token is None:
+            return response
+        replica_reads.reset(token)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            mark_recently_wrote(response)
+        return response
+
+
+class ServerTimingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SERVER_TIMING:
+            return self.get_response(request)
+        # Запросы к базе уже считает MetricsMiddleware: второй обёртки
+        # над соединениями не нужно.
+        timings = getattr(request, 'timings', None)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            if timings is None:
+                timings = stack.enter_context(
+                    count_queries(RequestTimings()))
+            token = request_timings.set(timings)
+            try:
+                response = self.get_response(request)
+            finally:
+                request_timings.reset(token)
+        timings.add('total', time.perf_counter() - started)
+        response['Server-Timing'] = timings.header()
+        self.log(request, response, timings)
+        return response
+
+    def process_template_response(self, request, response):
+        timings = request_timings.get()
+        if timings is None:
+            return response
+        started = time.perf_counter()
+
+        def rendered(response):
+            timings.add('render', time.perf_counter() - started)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, timings):
+        match = request.resolver_match
+        log_timings(
+            timings, method=request.method, path=request.path,
+            view=match.view_name if match else '',
+            status=response.status_code)
+
+
+def get_route_labels(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '', ''
+    initkwargs = getattr(match.func, 'initkwargs', {})
+    actions = getattr(match.func, 'actions', None)
+    if actions is not None:
+        return (initkwargs.get('basename', ''),
+                actions.get(request.method.lower(), ''))
+    return match.url_name or '', request.method.lower()
+
+
+class MetricsMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = request.timings = RequestTimings()
+        started = time.perf_counter()
+        with count_queries(timings):
+            response = self.get_response(request)
+        basename, action = get_route_labels(request)
+        record_request(basename, action, request.method,
+                       response.status_code, time.perf_counter() - started,
+                       timings.queries)
+        if response.streaming:
+            response.streaming_content = self.count_stream(
+                response.streaming_content, basename, action)
+        else:
+            record_response_size(basename, action, len(response.content))
+        return response
+
+    def count_stream(self, chunks, basename, action):
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            record_response_size(basename, action, size)
@@ -0,0 +1,63 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = 'replica'
+REPLICA_MODELS = {
+    'reviews.category',
+    'reviews.comment',
+    'reviews.genre',
+    'reviews.review',
+    'reviews.title',
+    'reviews.title_genre',
+    'reviews.titlescorehistogram',
+}
+STICKY_COOKIE = 'replica_sticky'
+
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def reading_from_replica():
+    return replica_reads.get() and replica_configured()
+
+
+def recently_wrote(request):
+    # Отметка о записи хранится в подписанной cookie, а не в кеше процесса:
+    # следующий запрос клиента может попасть в другой воркер.
+    return request.get_signed_cookie(
+        STICKY_COOKIE, default=None, salt=STICKY_COOKIE,
+        max_age=settings.REPLICA_LAG) is not None
+
+
+def mark_recently_wrote(response):
+    response.set_signed_cookie(
+        STICKY_COOKIE, '1', salt=STICKY_COOKIE,
+        max_age=settings.REPLICA_LAG, httponly=True, samesite='Lax')
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (model._meta.label_lower in REPLICA_MODELS
+                and reading_from_replica()):
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -1,5 +1,6 @@
 import datetime
 import os
+import tempfile
 
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -28,7 +29,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.middleware.MetricsMiddleware',
+    'api_yamdb.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.middleware.CompressionMiddleware',
+    'api_yamdb.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,11 +66,66 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 600,
+        'TRANSACTION_MODE': 'IMMEDIATE',
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'cache_size': -20000,
+            'mmap_size': 268435456,
+            'temp_store': 'MEMORY',
+        },
+    }
+}
+
+# Реплика для чтения подключается, если задан путь к её файлу.
+REPLICA_DATABASE_NAME = os.getenv('REPLICA_DATABASE_NAME')
+if REPLICA_DATABASE_NAME:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': REPLICA_DATABASE_NAME,
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+
+REPLICA_LAG = 5
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yamdb',
+    },
+    # Общий для всех процессов сервера: версии каталога и пользователей.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv(
+            'SHARED_CACHE_DIR',
+            os.path.join(tempfile.gettempdir(), 'yamdb_cache')),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
 }
 
+CATALOG_CACHE_TIMEOUT = 600
+
+USER_CACHE_SIZE = 10000
+
+USER_CACHE_TTL = 60
+
+THROTTLE_BUCKETS_SIZE = 100000
+
+ASGI_THREADS = 16
+ASGI_SNAPSHOT_SIZE = 1000
+
+SERVER_TIMING = os.getenv('SERVER_TIMING', '') == '1'
+
+METRICS_DIR = os.getenv('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 1
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,8 +147,23 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '10/min',
+        'signup_username': '3/min',
+        'token_ip': '30/min',
+        'token_username': '10/min',
+    },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
@@ -120,6 +195,12 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static/'),)
 
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+
+STATICFILES_STORAGE = 'api_yamdb.storage.CompressedStaticFilesStorage'
+
+COMPRESSION_MIN_SIZE = 1024
+
 ADMIN_ROLE = 'admin'
 MODERATOR_ROLE = 'moderator'
 USER_ROLE = 'user'
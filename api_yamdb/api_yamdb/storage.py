@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .compression import (SUFFIXES, compress, get_encodings, guess_type,
+                          is_compressible_type)
+
+
+class CompressedStaticFilesStorage(StaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            return
+        for name in paths:
+            if not is_compressible_type(guess_type(name)):
+                continue
+            with self.open(name) as static_file:
+                content = static_file.read()
+            if len(content) < settings.COMPRESSION_MIN_SIZE:
+                continue
+            for encoding in get_encodings():
+                compressed = compress(content, encoding, static=True)
+                if len(compressed) >= len(content):
+                    continue
+                compressed_name = name + SUFFIXES[encoding]
+                if self.exists(compressed_name):
+                    self.delete(compressed_name)
+                self.save(compressed_name, ContentFile(compressed))
+                yield name, compressed_name, True
@@ -0,0 +1,71 @@
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+request_timings = ContextVar('request_timings', default=None)
+
+logger = logging.getLogger('api_yamdb.timing')
+
+
+class RequestTimings:
+
+    def __init__(self):
+        self.durations = {}
+        self.queries = 0
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0) + duration
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - started)
+
+    def as_dict(self):
+        timings = {name: round(duration * 1000, 2)
+                   for name, duration in self.durations.items()}
+        timings['queries'] = self.queries
+        return timings
+
+    def header(self):
+        metrics = []
+        for name, duration in self.durations.items():
+            metric = f'{name};dur={duration * 1000:.2f}'
+            if name == 'db':
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+
+@contextmanager
+def timed(name):
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+@contextmanager
+def count_queries(timings):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings))
+        yield timings
+
+
+def log_timings(timings, **values):
+    values.update(timings.as_dict())
+    logger.info(
+        ' '.join(f'{name}={value}' for name, value in values.items()),
+        extra={'timings': values})
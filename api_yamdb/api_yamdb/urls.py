@@ -1,14 +1,29 @@
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, re_path
 from django.urls.conf import include
 from django.views.generic import TemplateView
 
+from .views import metrics, precompressed_static
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('metrics', metrics, name='metrics'),
     path(
         'redoc/',
         TemplateView.as_view(template_name='redoc.html'),
         name='redoc'
     ),
 ]
+
+# Статику с другого домена отдаёт не Django.
+if not urlsplit(settings.STATIC_URL).netloc:
+    urlpatterns.append(re_path(
+        rf'^{re.escape(settings.STATIC_URL.lstrip("/"))}(?P<path>.+)$',
+        precompressed_static,
+        name='static'
+    ))
@@ -0,0 +1,54 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import SUFFIXES, choose_encoding, get_encodings, guess_type
+from .metrics import CONTENT_TYPE, collect, render
+
+
+def find_static(path):
+    if settings.STATIC_ROOT:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+        if os.path.isfile(full_path):
+            return full_path
+    return finders.find(path)
+
+
+def precompressed_static(request, path):
+    full_path = find_static(path)
+    if not full_path or not os.path.isfile(full_path):
+        raise Http404
+    stat = os.stat(full_path)
+    variants = [
+        encoding for encoding in get_encodings()
+        if os.path.isfile(full_path + SUFFIXES[encoding])
+    ]
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              stat.st_mtime, stat.st_size):
+        response = HttpResponseNotModified()
+    else:
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING'), variants)
+        served_path = full_path
+        if encoding is not None:
+            served_path += SUFFIXES[encoding]
+        response = FileResponse(
+            open(served_path, 'rb'), content_type=guess_type(full_path))
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+    # Кеши должны различать варианты и для ответа 304.
+    if variants:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def metrics(request):
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from reviews.models import Category, Genre, Title, User
+from reviews.models import Category, Genre, OutboxEmail, Title, User
 
 
 class UserAdmin(UserAdmin):
@@ -42,3 +42,14 @@ class TitleAdmin(admin.ModelAdmin):
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Genre, GenreAdmin)
 admin.site.register(Title, TitleAdmin)
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'recipient', 'subject', 'attempts', 'send_after',
+                    'sent_at')
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
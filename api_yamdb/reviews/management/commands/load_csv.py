@@ -0,0 +1,136 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleScoreHistogram, User)
+
+IMPORT_ORDER = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': 'category_id'}),
+    ('genre_title.csv', Title.genre.through, {}),
+    ('review.csv', Review, {'author': 'author_id'}),
+    ('comments.csv', Comment, {'author': 'author_id'}),
+)
+UNUSABLE_PASSWORD = make_password(None)
+
+
+@contextmanager
+def keep_auto_now_add(model, columns):
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.attname in columns
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает CSV-файлы из static/data в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV-файлами.')
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Количество строк в одном bulk_create.')
+        parser.add_argument(
+            '--transaction-size', type=int, default=100000,
+            help='Количество строк в одной транзакции.')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки с уже существующими id.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isdir(path):
+            raise CommandError(f'Каталог {path} не найден.')
+        started = time.monotonic()
+        total = 0
+        loaded_models = []
+        for filename, model, columns in IMPORT_ORDER:
+            file_path = os.path.join(path, filename)
+            if not os.path.exists(file_path):
+                self.stdout.write(self.style.WARNING(
+                    f'{filename}: файл не найден, пропускаем.'))
+                continue
+            total += self.load_file(file_path, model, columns, options)
+            loaded_models.append(model)
+
+        self.reset_sequences(loaded_models)
+        Title.objects.rebuild_ratings()
+        TitleScoreHistogram.objects.rebuild()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.1f} с '
+            f'({total / max(elapsed, 1e-6):.0f} строк/с).'))
+
+    def load_file(self, file_path, model, columns, options):
+        filename = os.path.basename(file_path)
+        started = time.monotonic()
+        loaded = 0
+        with open(file_path, encoding='utf-8', newline='') as csv_file:
+            reader = csv.DictReader(csv_file)
+            header = {columns.get(name, name) for name in reader.fieldnames}
+            objects = (self.build(model, row, columns) for row in reader)
+            batches = iter(
+                lambda: list(islice(objects, options['batch_size'])), [])
+            exhausted = False
+            with keep_auto_now_add(model, header):
+                while not exhausted:
+                    with transaction.atomic():
+                        in_transaction = 0
+                        for batch in batches:
+                            model.objects.bulk_create(
+                                batch,
+                                batch_size=options['batch_size'],
+                                ignore_conflicts=options['ignore_conflicts'])
+                            in_transaction += len(batch)
+                            if in_transaction >= options['transaction_size']:
+                                break
+                        else:
+                            exhausted = True
+                    loaded += in_transaction
+                    self.report(filename, loaded, started)
+        return loaded
+
+    def build(self, model, row, columns):
+        values = {}
+        for name, value in row.items():
+            attname = columns.get(name, name)
+            field = model._meta.get_field(attname)
+            if value == '' and field.null:
+                value = None
+            values[field.attname] = value
+        if model is User:
+            values.setdefault('password', UNUSABLE_PASSWORD)
+        return model(**values)
+
+    def report(self, filename, loaded, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{filename}: {loaded} строк, '
+            f'{loaded / max(elapsed, 1e-6):.0f} строк/с')
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
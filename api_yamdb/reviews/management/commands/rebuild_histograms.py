@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import TitleScoreHistogram
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает распределение оценок всех произведений.'
+
+    def handle(self, *args, **options):
+        rebuilt = TitleScoreHistogram.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано распределений оценок: {rebuilt}'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинг и количество отзывов всех произведений.'
+
+    def handle(self, *args, **options):
+        updated = Title.objects.rebuild_ratings()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитан рейтинг произведений: {updated}'))
@@ -0,0 +1,123 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить накопившиеся письма и завершить работу.')
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Количество потоков отправки.')
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Количество писем, забираемых из очереди за раз.')
+        parser.add_argument(
+            '--poll-interval', type=float, default=5,
+            help='Пауза между проверками пустой очереди, в секундах.')
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='Количество попыток отправки одного письма.')
+        parser.add_argument(
+            '--backoff', type=float, default=30,
+            help='Задержка перед повторной отправкой, в секундах. '
+                 'Удваивается с каждой попыткой.')
+        parser.add_argument(
+            '--lease', type=float, default=300,
+            help='На сколько секунд письмо резервируется за воркером.')
+
+    def handle(self, *args, **options):
+        with ThreadPoolExecutor(options['threads']) as pool:
+            while True:
+                delivered = self.drain(pool, options)
+                if delivered:
+                    continue
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+
+    def drain(self, pool, options):
+        now = timezone.now()
+        candidates = list(OutboxEmail.objects.filter(
+            sent_at__isnull=True,
+            send_after__lte=now,
+            attempts__lt=options['max_attempts'],
+        ).order_by('send_after', 'id')[:options['batch_size']])
+        if not candidates:
+            return 0
+        emails = self.claim(
+            candidates, now + timedelta(seconds=options['lease']))
+        if not emails:
+            # Всю пачку забрали другие воркеры: берём следующую.
+            return len(candidates)
+
+        threads = min(options['threads'], len(emails))
+        chunks = [emails[index::threads] for index in range(threads)]
+        sent, failed = [], []
+        for chunk_sent, chunk_failed in pool.map(self.deliver, chunks):
+            sent.extend(chunk_sent)
+            failed.extend(chunk_failed)
+
+        now = timezone.now()
+        OutboxEmail.objects.filter(pk__in=sent).update(
+            sent_at=now, attempts=F('attempts') + 1, last_error='')
+        for email, error in failed:
+            email.attempts += 1
+            email.last_error = repr(error)
+            email.send_after = now + timedelta(
+                seconds=options['backoff'] * 2 ** (email.attempts - 1))
+            email.save(update_fields=('attempts', 'last_error', 'send_after'))
+        self.stdout.write(
+            f'Отправлено писем: {len(sent)}, ошибок: {len(failed)}')
+        return len(sent) + len(failed)
+
+    @staticmethod
+    def claim(emails, leased_until):
+        # Письмо достаётся воркеру, чей UPDATE застал прежний send_after:
+        # у остальных условие уже не выполнится и строка не изменится.
+        return [
+            email for email in emails
+            if OutboxEmail.objects.filter(
+                pk=email.pk,
+                sent_at__isnull=True,
+                send_after=email.send_after,
+            ).update(send_after=leased_until) == 1
+        ]
+
+    @staticmethod
+    def deliver(emails):
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            return [], [(email, error) for email in emails]
+        sent, failed = [], []
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=[email.recipient],
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    failed.append((email, error))
+                else:
+                    sent.append(email.pk)
+        finally:
+            connection.close()
+        return sent, failed
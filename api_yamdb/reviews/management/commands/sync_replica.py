@@ -0,0 +1,56 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from api_yamdb.routers import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = 'Копирует основную базу SQLite в реплику для чтения.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', help='Файл основной базы. По умолчанию из DATABASES.')
+        parser.add_argument(
+            '--target', help='Файл реплики. По умолчанию из DATABASES.')
+        parser.add_argument(
+            '--pages', type=int, default=1024,
+            help='Количество страниц, копируемых за один шаг.')
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять копирование каждые N секунд. '
+                 'По умолчанию копирует один раз.')
+
+    def handle(self, *args, **options):
+        source = options['source'] or self.get_name(DEFAULT_DB_ALIAS)
+        target = options['target'] or self.get_name(REPLICA_ALIAS)
+        while True:
+            started = time.monotonic()
+            self.copy(source, target, options['pages'])
+            self.stdout.write(
+                f'Реплика {target} обновлена за '
+                f'{time.monotonic() - started:.2f} с.')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def get_name(self, alias):
+        if alias not in settings.DATABASES:
+            raise CommandError(
+                f'База {alias} не настроена. Задайте REPLICA_DATABASE_NAME '
+                f'или передайте --source и --target.')
+        return settings.DATABASES[alias]['NAME']
+
+    def copy(self, source, target, pages):
+        source_db = sqlite3.connect(source)
+        target_db = sqlite3.connect(target)
+        try:
+            # Онлайн-копия: запись в основную базу не блокируется целиком,
+            # а читатели реплики видят либо старую, либо новую версию.
+            source_db.backup(target_db, pages=pages)
+        finally:
+            target_db.close()
+            source_db.close()
@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:08
+
+from django.db import migrations, models
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')).order_by().values('title')
+    Title.objects.update(
+        score_sum=Coalesce(Subquery(
+            reviews.annotate(total=Sum('score')).values('total')), 0),
+        review_count=Coalesce(Subquery(
+            reviews.annotate(total=Count('id')).values('total')), 0),
+    )
+    Title.objects.update(rating=Case(
+        When(review_count__gt=0, then=F('score_sum') / F('review_count')),
+        default=None,
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.IntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг произведения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from reviews.search import create_title_search, drop_title_search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_title_search, drop_title_search),
+    ]
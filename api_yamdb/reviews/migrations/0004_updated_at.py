@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:14
+
+from django.db import migrations, models
+from django.db.models import F
+
+from reviews.search import create_title_search
+
+
+def fill_updated_at(apps, schema_editor):
+    for model_name in ('Review', 'Comment'):
+        model = apps.get_model('reviews', model_name)
+        model.objects.update(updated_at=F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'updated_at'], name='comment_review_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'updated_at'], name='review_title_updated_idx'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        # SQLite пересоздает reviews_title при добавлении поля,
+        # вместе со старой таблицей удаляются триггеры поискового индекса.
+        migrations.RunPython(create_title_search, migrations.RunPython.noop),
+    ]
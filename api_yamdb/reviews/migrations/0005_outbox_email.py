@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:16
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='Тема письма')),
+                ('message', models.TextField(verbose_name='Текст письма')),
+                ('from_email', models.CharField(max_length=254, verbose_name='Отправитель')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Отправить не раньше')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Количество попыток')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ['send_after'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['sent_at', 'send_after'], name='outbox_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def fill_histograms(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleScoreHistogram = apps.get_model('reviews', 'TitleScoreHistogram')
+    histograms = {}
+    rows = Review.objects.order_by().values_list(
+        'title_id', 'score').annotate(total=Count('id'))
+    for title_id, score, total in rows:
+        histogram = histograms.setdefault(
+            title_id, TitleScoreHistogram(title_id=title_id))
+        setattr(histogram, f'score_{score}', total)
+    TitleScoreHistogram.objects.bulk_create(histograms.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outbox_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScoreHistogram',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_histogram', serialize=False, to='reviews.Title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0)),
+                ('score_2', models.PositiveIntegerField(default=0)),
+                ('score_3', models.PositiveIntegerField(default=0)),
+                ('score_4', models.PositiveIntegerField(default=0)),
+                ('score_5', models.PositiveIntegerField(default=0)),
+                ('score_6', models.PositiveIntegerField(default=0)),
+                ('score_7', models.PositiveIntegerField(default=0)),
+                ('score_8', models.PositiveIntegerField(default=0)),
+                ('score_9', models.PositiveIntegerField(default=0)),
+                ('score_10', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+            },
+        ),
+        migrations.RunPython(fill_histograms, migrations.RunPython.noop),
+    ]
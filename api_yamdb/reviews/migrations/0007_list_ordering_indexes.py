@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_score_histogram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'pub_date', 'id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['author', 'pub_date'], name='comment_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date', 'id'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['author', 'pub_date'], name='review_author_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+        ),
+    ]
@@ -3,7 +3,11 @@ import uuid
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, OuterRef,
+                              Subquery, Sum, When)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from .validators import year_validator
 
@@ -50,6 +54,10 @@ class User(AbstractUser):
         ordering = ['date_joined']
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            models.Index(fields=['date_joined'],
+                         name='user_date_joined_idx'),
+        ]
 
     def __str__(self):
         return str(self.email)
@@ -101,6 +109,41 @@ class Genre(models.Model):
         return self.slug
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def add_scores(self, score_delta, count_delta):
+        score_sum = F('score_sum') + score_delta
+        review_count = F('review_count') + count_delta
+        return self.update(
+            score_sum=score_sum,
+            review_count=review_count,
+            updated_at=timezone.now(),
+            rating=Case(
+                When(review_count__gt=-count_delta,
+                     then=ExpressionWrapper(
+                         score_sum / review_count,
+                         output_field=models.IntegerField())),
+                default=None,
+            ),
+        )
+
+    def rebuild_ratings(self):
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')).order_by().values('title')
+        with transaction.atomic():
+            self.update(
+                score_sum=Coalesce(Subquery(
+                    reviews.annotate(total=Sum('score')).values('total')), 0),
+                review_count=Coalesce(Subquery(
+                    reviews.annotate(total=Count('id')).values('total')), 0),
+            )
+            return self.update(rating=Case(
+                When(review_count__gt=0,
+                     then=F('score_sum') / F('review_count')),
+                default=None,
+            ))
+
+
 class Title(models.Model):
 
     name = models.TextField(
@@ -127,6 +170,31 @@ class Title(models.Model):
         blank=True,
         null=True,
     )
+    rating = models.IntegerField(
+        verbose_name='Рейтинг произведения',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True,
+    )
+
+    objects = TitleQuerySet.as_manager()
+
+    RATING_FIELDS = ('rating', 'score_sum', 'review_count')
 
     class Meta:
         verbose_name = 'Произведение'
@@ -135,6 +203,15 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Review(models.Model):
     title = models.ForeignKey(
@@ -159,6 +236,10 @@ class Review(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True,
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         ordering = ['pub_date']
@@ -168,10 +249,22 @@ class Review(models.Model):
             models.UniqueConstraint(
                 fields=['title', 'author'], name='unique_review')
         ]
+        indexes = [
+            models.Index(fields=['title', 'updated_at'],
+                         name='review_title_updated_idx'),
+            models.Index(fields=['title', 'pub_date', 'id'],
+                         name='review_title_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='review_author_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -183,6 +276,10 @@ class Comment(models.Model):
         verbose_name='Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+    )
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='comments',
         verbose_name='Автор комментария',
@@ -192,6 +289,146 @@ class Comment(models.Model):
         ordering = ['pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(fields=['review', 'updated_at'],
+                         name='comment_review_updated_idx'),
+            models.Index(fields=['review', 'pub_date', 'id'],
+                         name='comment_review_pub_date_idx'),
+            models.Index(fields=['author', 'pub_date'],
+                         name='comment_author_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text
+
+
+SCORES = range(1, 11)
+
+
+class ScoreHistogramQuerySet(models.QuerySet):
+
+    def add_score(self, title_id, score, delta):
+        field = f'score_{score}'
+        if self.filter(title_id=title_id).update(**{field: F(field) + delta}):
+            return
+        if delta > 0:
+            _, created = self.get_or_create(
+                title_id=title_id, defaults={field: delta})
+            if not created:
+                self.filter(title_id=title_id).update(
+                    **{field: F(field) + delta})
+
+    def rebuild(self, batch_size=1000):
+        rows = Review.objects.order_by('title_id').values_list(
+            'title_id', 'score').annotate(total=Count('id'))
+        with transaction.atomic():
+            self.all().delete()
+            histograms = {}
+            for title_id, score, total in rows.iterator():
+                if (title_id not in histograms
+                        and len(histograms) >= batch_size):
+                    self.bulk_create(histograms.values())
+                    histograms = {}
+                histogram = histograms.setdefault(
+                    title_id, self.model(title_id=title_id))
+                setattr(histogram, f'score_{score}', total)
+            self.bulk_create(histograms.values())
+        return self.count()
+
+
+class TitleScoreHistogram(models.Model):
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, primary_key=True,
+        related_name='score_histogram', verbose_name='Произведение',
+    )
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    objects = ScoreHistogramQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+
+    def __str__(self):
+        return str(self.title_id)
+
+    @property
+    def histogram(self):
+        return {score: getattr(self, f'score_{score}') for score in SCORES}
+
+    def score_at(self, position):
+        seen = 0
+        for score, total in self.histogram.items():
+            seen += total
+            if position < seen:
+                return score
+        return None
+
+    def get_stats(self):
+        histogram = self.histogram
+        count = sum(histogram.values())
+        stats = {
+            'count': count,
+            'mean': None,
+            'median': None,
+            'std': None,
+            'histogram': {str(score): total
+                          for score, total in histogram.items()},
+        }
+        if not count:
+            return stats
+        mean = sum(score * total for score, total in histogram.items()) / count
+        variance = sum(
+            total * (score - mean) ** 2 for score, total in histogram.items()
+        ) / count
+        stats['mean'] = mean
+        stats['median'] = (
+            self.score_at((count - 1) // 2) + self.score_at(count // 2)) / 2
+        stats['std'] = variance ** 0.5
+        return stats
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField(verbose_name='Тема письма', max_length=255)
+    message = models.TextField(verbose_name='Текст письма')
+    from_email = models.CharField(verbose_name='Отправитель', max_length=254)
+    recipient = models.EmailField(verbose_name='Получатель')
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    send_after = models.DateTimeField(
+        verbose_name='Отправить не раньше',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток',
+        default=0,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+
+    class Meta:
+        ordering = ['send_after']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(fields=['sent_at', 'send_after'],
+                         name='outbox_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
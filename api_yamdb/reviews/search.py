@@ -0,0 +1,78 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+TITLE_SEARCH_TABLE = 'reviews_title_fts'
+
+CREATE_TITLE_SEARCH_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_SEARCH_TABLE} USING fts5("
+    "name, description, content='reviews_title', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+)
+CREATE_TITLE_SEARCH_TRIGGERS_SQL = (
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_ai "
+    "AFTER INSERT ON reviews_title BEGIN "
+    f"INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_ad "
+    "AFTER DELETE ON reviews_title BEGIN "
+    f"INSERT INTO {TITLE_SEARCH_TABLE}"
+    f"({TITLE_SEARCH_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_SEARCH_TABLE}_au "
+    "AFTER UPDATE OF name, description ON reviews_title BEGIN "
+    f"INSERT INTO {TITLE_SEARCH_TABLE}"
+    f"({TITLE_SEARCH_TABLE}, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+)
+REBUILD_TITLE_SEARCH_SQL = (
+    f"INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) "
+    "VALUES ('rebuild')",
+)
+DROP_TITLE_SEARCH_SQL = (
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_au',
+    f'DROP TABLE IF EXISTS {TITLE_SEARCH_TABLE}',
+)
+
+
+def _execute(schema_editor, statements):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_title_search(apps, schema_editor):
+    _execute(schema_editor, CREATE_TITLE_SEARCH_SQL
+             + CREATE_TITLE_SEARCH_TRIGGERS_SQL
+             + REBUILD_TITLE_SEARCH_SQL)
+
+
+def drop_title_search(apps, schema_editor):
+    _execute(schema_editor, DROP_TITLE_SEARCH_SQL)
+
+
+def search_query(text):
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+def search_titles(queryset, text):
+    query = search_query(text)
+    if not query:
+        return queryset.none()
+    if connections[queryset.db].vendor != 'sqlite':
+        return queryset.filter(
+            Q(name__icontains=text) | Q(description__icontains=text))
+    return queryset.extra(
+        tables=[TITLE_SEARCH_TABLE],
+        where=[f'{TITLE_SEARCH_TABLE}.rowid = reviews_title.id',
+               f'{TITLE_SEARCH_TABLE} MATCH %s'],
+        params=[query],
+        select={'search_rank': f'{TITLE_SEARCH_TABLE}.rank'},
+        order_by=['search_rank', 'id'],
+    )
@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Review, Title, TitleScoreHistogram
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_score(sender, instance, raw, **kwargs):
+    instance._previous_score = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_score = sender.objects.filter(
+        pk=instance.pk).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_score', None)
+    if previous == (instance.title_id, instance.score):
+        return
+    if previous is None:
+        Title.objects.filter(pk=instance.title_id).add_scores(
+            instance.score, 1)
+    else:
+        title_id, score = previous
+        TitleScoreHistogram.objects.add_score(title_id, score, -1)
+        if title_id == instance.title_id:
+            Title.objects.filter(pk=title_id).add_scores(
+                instance.score - score, 0)
+        else:
+            Title.objects.filter(pk=title_id).add_scores(-score, -1)
+            Title.objects.filter(pk=instance.title_id).add_scores(
+                instance.score, 1)
+    TitleScoreHistogram.objects.add_score(
+        instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.title_id).add_scores(-instance.score, -1)
+    TitleScoreHistogram.objects.add_score(
+        instance.title_id, instance.score, -1)
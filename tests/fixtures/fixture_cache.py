@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache, caches
+
+    from api.authentication import user_cache
+    from api.throttling import bucket_store
+    from api_yamdb.asgi_handlers import snapshot_store
+    from api_yamdb.metrics import metrics_store
+
+    cache.clear()
+    caches['shared'].clear()
+    user_cache.clear()
+    bucket_store.clear()
+    snapshot_store.clear()
+    metrics_store.clear()
@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08TitleRating:
+
+    @staticmethod
+    def get_title(title_id):
+        from reviews.models import Title
+        return Title.objects.get(id=title_id)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_stored_on_review_changes(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title = self.get_title(titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что при создании отзыва у произведения обновляются '
+            '`score_sum`, `review_count` и `rating`'
+        )
+
+        response = auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 10}
+        )
+        assert response.status_code == 200
+        title = self.get_title(titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (19, 3, 6), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается рейтинг произведения'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        assert response.status_code == 204
+        title = self.get_title(titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (14, 2, 7), (
+            'Проверьте, что при удалении отзыва пересчитывается рейтинг произведения'
+        )
+
+        moderator.delete()
+        user.delete()
+        title = self.get_title(titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (0, 0, None), (
+            'Проверьте, что при каскадном удалении отзывов вместе с автором '
+            'пересчитывается рейтинг произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(score_sum=0, review_count=0, rating=None)
+        call_command('rebuild_ratings', stdout=StringIO())
+        title = self.get_title(titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг произведений'
+        )
+        title = self.get_title(titles[1]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (0, 0, None)
@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test09TitleQueries:
+
+    @staticmethod
+    def count_queries(client, url, method='get', **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url, **kwargs)
+        assert response.status_code in (200, 201), response.content
+        return len(context)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_fixed_queries(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        few = self.count_queries(client, '/api/v1/titles/')
+        for number in range(8):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}', 'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            })
+        many = self.count_queries(client, '/api/v1/titles/')
+        assert few == many, (
+            'Проверьте, что количество запросов к БД при GET запросе '
+            '`/api/v1/titles/` не зависит от количества произведений на странице'
+        )
+        detail = self.count_queries(client, f'/api/v1/titles/{titles[0]["id"]}/')
+        assert detail <= 2, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` '
+            'категория и жанры загружаются без дополнительных запросов на каждый объект'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_write_response_fixed_queries(self, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        data = {'name': 'Новое', 'year': 2001, 'category': categories[0]['slug'],
+                'genre': [genre['slug'] for genre in genres]}
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data)
+        assert response.status_code == 201
+        genre_reads = [
+            query for query in context.captured_queries
+            if 'INNER JOIN "reviews_title_genre"' in query['sql']
+            and query['sql'].startswith('SELECT "reviews_genre"."id", "reviews_genre"."name"')
+        ]
+        assert len(genre_reads) == 1, (
+            'Проверьте, что ответ на POST запрос `/api/v1/titles/` '
+            'загружает жанры произведения одним запросом'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(
+                f'/api/v1/titles/{response.json()["id"]}/', data={'name': 'Старое'})
+        assert response.status_code == 200
+        assert len(context) <= 5, (
+            'Проверьте, что ответ на PATCH запрос `/api/v1/titles/{title_id}/` '
+            'выполняет фиксированное количество запросов к БД'
+        )
@@ -0,0 +1,70 @@
+import pytest
+from django.utils import timezone
+
+from .common import create_titles
+
+
+class Test10CursorPagination:
+
+    @staticmethod
+    def walk(client, url):
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, response.content
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что при пагинации по курсору не возвращается `count`'
+            )
+            pages.append(data)
+            url = data['next']
+        return pages
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cursor(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        for number in range(11):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}', 'year': 2000,
+                'genre': [genres[0]['slug']], 'category': categories[0]['slug'],
+            })
+        response = client.get('/api/v1/titles/')
+        assert 'count' in response.json(), (
+            'Проверьте, что без параметра `cursor` используется постраничная пагинация'
+        )
+
+        pages = self.walk(client, '/api/v1/titles/?cursor=')
+        ids = [title['id'] for page in pages for title in page['results']]
+        assert len(pages) == 2 and ids == sorted(ids) and len(set(ids)) == 13, (
+            'Проверьте, что пагинация по курсору `/api/v1/titles/?cursor=` '
+            'возвращает все произведения по порядку `id` без повторов'
+        )
+        assert pages[0]['previous'] is None
+        previous = client.get(pages[1]['previous']).json()
+        assert previous['results'] == pages[0]['results'], (
+            'Проверьте, что ссылка `previous` возвращает предыдущую страницу'
+        )
+
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_cursor_same_pub_date(self, client, admin_client, django_user_model):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'author{number}', email=f'author{number}@yamdb.fake')
+            for number in range(15)
+        ]
+        for author in authors:
+            Review.objects.create(
+                title_id=titles[0]['id'], author=author, text='текст', score=5)
+        Review.objects.update(pub_date=timezone.now())
+
+        pages = self.walk(client, f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=')
+        ids = [review['id'] for page in pages for review in page['results']]
+        assert ids == sorted(Review.objects.values_list('id', flat=True)), (
+            'Проверьте, что пагинация по курсору отзывов упорядочена по `(pub_date, id)` '
+            'и не теряет отзывы с одинаковой датой публикации'
+        )
@@ -0,0 +1,44 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test11TitleSearch:
+
+    @staticmethod
+    def search(client, text):
+        response = client.get('/api/v1/titles/', {'search': text})
+        assert response.status_code == 200, response.content
+        return [title['name'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'ПОВОРОТ') == ['Поворот туда'], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по названию без учета регистра'
+        )
+        assert self.search(client, 'драм') == ['Проект'], (
+            'Проверьте, что `/api/v1/titles/?search=` ищет по началу слова в описании'
+        )
+        assert self.search(client, 'главная года') == ['Проект']
+        assert self.search(client, '"*') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_ranking_and_sync(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Драма', 'year': 2010, 'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'], 'description': 'Драма о драме'})
+        assert self.search(client, 'драма') == ['Драма', 'Проект'], (
+            'Проверьте, что результаты `/api/v1/titles/?search=` упорядочены по релевантности'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[1]["id"]}/', data={'description': 'Комедия'})
+        assert self.search(client, 'драма') == ['Драма'], (
+            'Проверьте, что поисковый индекс обновляется при изменении произведения'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert self.search(client, 'поворот') == [], (
+            'Проверьте, что поисковый индекс обновляется при удалении произведения'
+        )
@@ -0,0 +1,56 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def csv_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8') as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+class Test12LoadCsv:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_csv(self):
+        from reviews.models import Comment, Genre, Review, Title, User
+        out = StringIO()
+        call_command('load_csv', batch_size=7, transaction_size=20, stdout=out)
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что команда `load_csv` выводит скорость загрузки'
+        )
+
+        assert User.objects.count() == len(csv_rows('users.csv'))
+        assert Genre.objects.count() == len(csv_rows('genre.csv'))
+        assert Title.objects.count() == len(csv_rows('titles.csv'))
+        assert Title.genre.through.objects.count() == len(csv_rows('genre_title.csv')), (
+            'Проверьте, что команда `load_csv` заполняет связи произведений и жанров'
+        )
+        assert Comment.objects.count() == len(csv_rows('comments.csv'))
+
+        reviews = csv_rows('review.csv')
+        assert Review.objects.count() == len(reviews)
+        review = Review.objects.get(id=reviews[0]['id'])
+        assert review.author_id == int(reviews[0]['author']), (
+            'Проверьте, что команда `load_csv` сохраняет id из CSV-файлов'
+        )
+        assert review.pub_date.isoformat().startswith(reviews[0]['pub_date'][:19]), (
+            'Проверьте, что команда `load_csv` сохраняет дату публикации из CSV-файла'
+        )
+        scores = [int(row['score']) for row in reviews if row['title_id'] == reviews[0]['title_id']]
+        title = Title.objects.get(id=reviews[0]['title_id'])
+        assert title.rating == sum(scores) // len(scores), (
+            'Проверьте, что после загрузки отзывов пересчитывается рейтинг произведений'
+        )
+        assert title.score_histogram.get_stats()['count'] == len(scores), (
+            'Проверьте, что после загрузки отзывов пересчитывается распределение оценок'
+        )
+
+        call_command('load_csv', ignore_conflicts=True, stdout=StringIO())
+        assert Review.objects.count() == len(reviews)
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test13CatalogCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_repeated_list_without_queries(self, client, admin_client):
+        create_titles(admin_client)
+        for url in ('/api/v1/categories/', '/api/v1/genres/', '/api/v1/titles/'):
+            first = client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                second = client.get(url)
+            assert second.json() == first.json()
+            assert len(context) == 0, (
+                f'Проверьте, что повторный GET запрос `{url}` отдается из кеша '
+                'без запросов к БД'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_invalidation(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/titles/')
+
+        admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что кеш `/api/v1/categories/` сбрасывается при создании категории'
+        )
+
+        user, _ = create_users_api(admin_client)
+        auth_client(user).post(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 8})
+        results = client.get('/api/v1/titles/').json()['results']
+        rating = {title['id']: title['rating'] for title in results}
+        assert rating[titles[0]['id']] == 8, (
+            'Проверьте, что кеш `/api/v1/titles/` сбрасывается при изменении рейтинга'
+        )
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        results = client.get('/api/v1/titles/').json()['results']
+        category = {title['id']: title['category'] for title in results}
+        assert category[titles[0]['id']] is None, (
+            'Проверьте, что кеш `/api/v1/titles/` сбрасывается при удалении категории'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_version_bumped_after_commit(self):
+        from django.db import transaction
+
+        from api.cache import get_version
+        from reviews.models import Category
+
+        version = get_version('categories')
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            assert get_version('categories') == version, (
+                'Проверьте, что версия каталога меняется только после '
+                'фиксации транзакции'
+            )
+        assert get_version('categories') != version
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_version_shared_between_processes(self, client, admin_client):
+        from django.conf import settings
+        from django.core.cache.backends.filebased import FileBasedCache
+
+        from api.cache import version_key
+        from reviews.models import Category
+
+        create_titles(admin_client)
+        client.get('/api/v1/categories/')
+        # Отдельный экземпляр кеша заменяет другой процесс сервера.
+        other = FileBasedCache(settings.CACHES['shared']['LOCATION'], {})
+        Category.objects.update(name='Переименовано')
+        other.set(version_key('categories'), 'other-process', None)
+        names = {category['name']
+                 for category in client.get('/api/v1/categories/').json()['results']}
+        assert names == {'Переименовано'}, (
+            'Проверьте, что версии каталога хранятся в общем для всех '
+            'процессов кеше'
+        )
@@ -0,0 +1,126 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre
+
+from .common import create_comments, create_reviews
+
+
+class Test14ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_list_etag(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что GET запрос `{url}` возвращает заголовок `ETag`'
+        )
+        assert not response.has_header('Last-Modified'), (
+            f'Проверьте, что список `{url}` не отдаёт `Last-Modified`: '
+            'он не отражает удаление записей'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с совпадающим `If-None-Match` возвращает статус 304'
+        )
+        assert not response.content
+        assert len(context) <= 2
+
+        detail_url = f'{url}{reviews[0]["id"]}/'
+        response = client.get(detail_url)
+        response = client.get(
+            detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Новый текст'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            f'Проверьте, что `ETag` списка `{url}` меняется при изменении отзыва'
+        )
+        etag = response['ETag']
+        admin_client.delete(f'{url}{reviews[1]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Проверьте, что `ETag` списка `{url}` меняется при удалении отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_detail_etag(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/{comments[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+            '/api/v1/titles/',
+        )
+        for url in urls:
+            etag = client.get(url)['ETag']
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304, (
+                f'Проверьте, что GET запрос `{url}` с совпадающим `If-None-Match` '
+                'возвращает статус 304'
+            )
+
+        url = f'/api/v1/titles/{titles[1]["id"]}/'
+        etag = client.get(url)['ETag']
+        response = admin_client.post(
+            f'{url}reviews/', data={'text': 'Еще', 'score': 1})
+        assert response.status_code == 201
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что `ETag` произведения меняется при изменении его рейтинга'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_nested_catalog_changes(self, client, admin_client):
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Поворот туда', 'year': 2000, 'category': 'films',
+            'genre': ['drama']})
+        title_id = response.json()['id']
+        urls = ('/api/v1/titles/', f'/api/v1/titles/{title_id}/')
+
+        def rename(model, slug):
+            instance = model.objects.get(slug=slug)
+            instance.name = 'Новое название'
+            instance.save()
+
+        changes = (
+            lambda: rename(Genre, 'drama'),
+            lambda: rename(Category, 'films'),
+            lambda: admin_client.delete('/api/v1/categories/films/'),
+        )
+        for change in changes:
+            etags = [client.get(url)['ETag'] for url in urls]
+            change()
+            for url, etag in zip(urls, etags):
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                assert response.status_code == 200, (
+                    f'Проверьте, что `ETag` `{url}` меняется при изменении '
+                    'вложенных категории или жанра'
+                )
+                assert not response.has_header('Last-Modified')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_updated_at_hidden(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            review_url,
+            f'{review_url}comments/{comments[0]["id"]}/',
+        )
+        for url in urls:
+            assert 'updated_at' not in client.get(url).json(), (
+                f'Проверьте, что ответ `{url}` не содержит служебное поле '
+                '`updated_at`'
+            )
@@ -0,0 +1,87 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class Test15MailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        from reviews.models import OutboxEmail
+        outbox_before_count = len(mail.outbox)
+        for number in range(5):
+            response = client.post(self.url_signup, data={
+                'email': f'user{number}@yamdb.fake', 'username': f'user{number}'})
+            assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что POST запрос `{self.url_signup}` не отправляет письмо '
+            'синхронно, а добавляет его в очередь'
+        )
+        assert OutboxEmail.objects.filter(sent_at__isnull=True).count() == 5
+
+        call_command('run_mail_worker', once=True, threads=2, batch_size=2, stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 5, (
+            'Проверьте, что команда `run_mail_worker` отправляет все письма из очереди'
+        )
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+        call_command('run_mail_worker', once=True, stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 5, (
+            'Проверьте, что письма из очереди отправляются только один раз'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_email_retried_with_backoff(self, client, settings):
+        from reviews.models import OutboxEmail
+        client.post(self.url_signup, data={
+            'email': 'retry@yamdb.fake', 'username': 'retry'})
+        settings.EMAIL_BACKEND = 'tests.test_15_mail_outbox.FailingEmailBackend'
+        call_command('run_mail_worker', once=True, backoff=60, stdout=StringIO())
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is None and email.attempts == 1, (
+            'Проверьте, что при ошибке отправки письмо остается в очереди'
+        )
+        assert 'SMTP' in email.last_error
+        assert (email.send_after - email.created_at).total_seconds() >= 60, (
+            'Проверьте, что повторная отправка откладывается'
+        )
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutboxEmail.objects.update(send_after=email.created_at)
+        call_command('run_mail_worker', once=True, stdout=StringIO())
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_claim_is_atomic(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from reviews.management.commands.run_mail_worker import Command
+        from reviews.models import OutboxEmail
+
+        for number in range(3):
+            OutboxEmail.objects.create(
+                subject='Код', message='Код', from_email='from@yamdb.fake',
+                recipient=f'user{number}@yamdb.fake')
+        candidates = list(OutboxEmail.objects.order_by('id'))
+        leased_until = timezone.now() + timedelta(minutes=5)
+        assert len(Command.claim(candidates[:1], leased_until)) == 1
+
+        claimed = Command.claim(candidates, leased_until)
+        assert [email.pk for email in claimed] == [
+            email.pk for email in candidates[1:]], (
+            'Проверьте, что письмо, уже зарезервированное другим воркером, '
+            'не забирается повторно'
+        )
+        assert Command.claim(candidates, leased_until) == []
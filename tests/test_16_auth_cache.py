@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client
+
+
+class Test16AuthUserCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_user_query_on_repeated_requests(self, user_client):
+        user_client.get('/api/v1/users/me/')
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200
+        assert response.json()['username'] == 'TestUser'
+        assert len(context) == 0, (
+            'Проверьте, что при повторном запросе с JWT-токеном пользователь '
+            'не загружается из БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cache_invalidated_on_role_change(self, admin_client, user):
+        client = auth_client(user)
+        assert client.get('/api/v1/users/').status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'})
+        assert response.status_code == 200
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что изменение роли пользователя сразу учитывается '
+            'при проверке прав'
+        )
+
+        user.refresh_from_db()
+        user.is_active = False
+        user.save()
+        assert client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что деактивированный пользователь не проходит аутентификацию'
+        )
+
+    def test_03_cache_bounded(self):
+        from api.authentication import UserCache
+        cache = UserCache(maxsize=2, ttl=60)
+        for user_id in range(3):
+            cache.set(user_id, ('v', 'default', [user_id]))
+        assert cache.get(0) is None and cache.get(2) is not None
+        expired = UserCache(maxsize=2, ttl=-1)
+        expired.set(1, ('v', 'default', [1]))
+        assert expired.get(1) is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_role_changed_in_other_process(self, user):
+        from django.conf import settings
+        from django.core.cache.backends.filebased import FileBasedCache
+
+        from api.authentication import user_version_key
+        from api.cache import new_version
+        from reviews.models import User
+
+        client = auth_client(user)
+        assert client.get('/api/v1/users/').status_code == 403
+        # Другой процесс меняет роль и обновляет версию в общем кеше.
+        other = FileBasedCache(settings.CACHES['shared']['LOCATION'], {})
+        User.objects.filter(pk=user.pk).update(role='admin')
+        other.set(user_version_key(user.pk), new_version(), None)
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что изменение пользователя в другом процессе '
+            'учитывается без ожидания истечения кеша'
+        )
@@ -0,0 +1,63 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_reviews, create_titles
+
+
+class Test17TitleStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_stats(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` без токена возвращает статус 200'
+        )
+        assert len(context) == 1
+        data = response.json()
+        assert data['count'] == 3 and data['mean'] == 4 and data['median'] == 4, (
+            f'Проверьте, что `{url}` возвращает количество, среднее и медиану оценок'
+        )
+        assert abs(data['std'] - (2 / 3) ** 0.5) < 1e-9
+        assert data['histogram'] == {
+            '1': 0, '2': 0, '3': 1, '4': 1, '5': 1,
+            '6': 0, '7': 0, '8': 0, '9': 0, '10': 0}
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/', data={'score': 10})
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[2]["id"]}/')
+        data = client.get(url).json()
+        assert data['histogram']['3'] == 0 and data['histogram']['4'] == 0
+        assert data['histogram']['10'] == 1, (
+            'Проверьте, что распределение оценок обновляется при изменении и удалении отзывов'
+        )
+        assert (data['count'], data['mean'], data['median']) == (2, 7.5, 7.5)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_stats_empty_and_missing(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = client.get(f'/api/v1/titles/{titles[0]["id"]}/stats/').json()
+        assert data['count'] == 0 and data['mean'] is None and data['median'] is None
+        assert client.get('/api/v1/titles/999/stats/').status_code == 404
+        assert client.get('/api/v1/titles/abc/stats/').status_code == 404, (
+            'Проверьте, что нечисловой идентификатор произведения '
+            'возвращает 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild_histograms(self, client, admin_client, admin):
+        from reviews.models import TitleScoreHistogram
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        expected = client.get(url).json()
+        TitleScoreHistogram.objects.all().delete()
+        call_command('rebuild_histograms', stdout=StringIO())
+        assert client.get(url).json() == expected, (
+            'Проверьте, что команда `rebuild_histograms` пересчитывает распределение оценок'
+        )
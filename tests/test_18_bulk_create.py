@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+
+class Test18BulkCreate:
+
+    @staticmethod
+    def inserts(context):
+        return [query for query in context.captured_queries
+                if query['sql'].startswith('INSERT')]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_categories_and_genres(self, client, admin_client):
+        for url in ('/api/v1/categories/', '/api/v1/genres/'):
+            data = [{'name': f'Объект {number}', 'slug': f'slug-{number}'}
+                    for number in range(30)]
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == 201, (
+                f'Проверьте, что POST запрос `{url}` со списком объектов возвращает статус 201'
+            )
+            assert response.json() == data
+            assert len(self.inserts(context)) == 1, (
+                f'Проверьте, что POST запрос `{url}` со списком объектов '
+                'добавляет их одним запросом `bulk_create`'
+            )
+            assert client.get(url).json()['count'] == 30
+
+            data = [{'name': 'Новый', 'slug': 'new'}, {'name': 'Старый', 'slug': 'slug-1'},
+                    {'name': 'Новый', 'slug': 'new'}, {'name': 'Без slug'}]
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == 400
+            errors = response.json()
+            assert errors[0] == {} and 'slug' in errors[3], (
+                f'Проверьте, что POST запрос `{url}` со списком объектов '
+                'возвращает ошибки для каждого объекта'
+            )
+            assert 'slug' in errors[1] and 'slug' in errors[2], (
+                f'Проверьте, что POST запрос `{url}` со списком объектов '
+                'сообщает о повторах slug вместе с ошибками полей'
+            )
+            assert client.get(url).json()['count'] == 30
+
+            data = [{'name': 'Новый', 'slug': 'new'}, {'name': 'Старый', 'slug': 'slug-1'},
+                    {'name': 'Новый', 'slug': 'new'}]
+            errors = admin_client.post(url, data=data, format='json').json()
+            assert errors[0] == {} and 'slug' in errors[1] and 'slug' in errors[2], (
+                f'Проверьте, что POST запрос `{url}` со списком объектов '
+                'проверяет уникальность slug в БД и внутри запроса'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_titles(self, client, admin_client):
+        from reviews.models import Title
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [{'name': f'Произведение {number}', 'year': 1990 + number,
+                 'genre': [genre['slug'] for genre in genres[:number % 3 + 1]],
+                 'category': categories[number % 2]['slug']}
+                for number in range(25)]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post('/api/v1/titles/', data=data, format='json')
+        assert response.status_code == 201, response.json()
+        assert len(self.inserts(context)) == 2, (
+            'Проверьте, что POST запрос `/api/v1/titles/` со списком произведений '
+            'добавляет произведения и связи с жанрами двумя запросами'
+        )
+        created = response.json()
+        assert [title['genre'] for title in created] == [title['genre'] for title in data]
+        for title in created:
+            stored = Title.objects.get(id=title['id'])
+            assert stored.name == title['name']
+            assert sorted(stored.genre.values_list('slug', flat=True)) == sorted(title['genre']), (
+                'Проверьте, что при массовом создании произведений сохраняются их жанры'
+            )
+        assert client.get('/api/v1/titles/').json()['count'] == 25
+
+        data = [{'name': 'Хорошее', 'year': 2000, 'genre': [genres[0]['slug']],
+                 'category': categories[0]['slug']},
+                {'name': 'Плохое', 'year': 3000, 'genre': ['unknown'],
+                 'category': categories[0]['slug']}]
+        response = admin_client.post('/api/v1/titles/', data=data, format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {} and {'year', 'genre'} <= set(errors[1])
+        assert Title.objects.count() == 25
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_titles_duplicate_genres(self, admin_client):
+        from reviews.models import Title
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        slug = genres[0]['slug']
+        data = [{'name': 'Повтор', 'year': 2000, 'genre': [slug, slug],
+                 'category': categories[0]['slug']},
+                {'name': 'Без повтора', 'year': 2001, 'genre': [slug],
+                 'category': categories[0]['slug']}]
+        response = admin_client.post('/api/v1/titles/', data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что повторяющиеся жанры одного произведения '
+            'не приводят к ошибке при массовом создании'
+        )
+        assert response.json()[0]['genre'] == [slug]
+        title = Title.objects.get(name='Повтор')
+        assert list(title.genre.values_list('slug', flat=True)) == [slug]
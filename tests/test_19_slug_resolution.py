@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre
+
+
+class Test19SlugResolution:
+
+    @staticmethod
+    def post(client, data):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/api/v1/titles/', data=data, format='json')
+        return response, len(context)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_constant_queries_per_title(self, admin_client):
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        categories = create_categories(admin_client)
+        data = {'name': 'Один жанр', 'year': 2000, 'genre': genres[:1],
+                'category': categories[0]['slug']}
+        response, one = self.post(admin_client, data)
+        assert response.status_code == 201
+        data = dict(data, name='Три жанра', genre=genres)
+        response, three = self.post(admin_client, data)
+        assert response.status_code == 201
+        assert one == three, (
+            'Проверьте, что количество запросов при создании произведения '
+            'не зависит от количества жанров'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_slugs_reported_together(self, admin_client):
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        categories = create_categories(admin_client)
+        response, _ = self.post(admin_client, {
+            'name': 'Ошибка', 'year': 2000, 'genre': [genres[0], 'missing', 'absent'],
+            'category': 'nothing'})
+        assert response.status_code == 400
+        errors = response.json()
+        assert 'missing' in errors['genre'][0] and 'absent' in errors['genre'][0], (
+            'Проверьте, что все несуществующие жанры перечислены в одной ошибке'
+        )
+        assert 'category' in errors
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_payload_resolved_once(self, admin_client):
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        categories = [category['slug'] for category in create_categories(admin_client)]
+
+        def payload(size):
+            return [{'name': f'Произведение {number}', 'year': 2000,
+                     'genre': genres[:number % 3 + 1], 'category': categories[number % 2]}
+                    for number in range(size)]
+
+        response, few = self.post(admin_client, payload(3))
+        assert response.status_code == 201
+        response, many = self.post(admin_client, payload(40))
+        assert response.status_code == 201
+        assert few == many, (
+            'Проверьте, что slug жанров и категорий в списке произведений '
+            'загружаются одним запросом на весь список'
+        )
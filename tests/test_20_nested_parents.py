@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import User
+
+from .common import create_comments, create_reviews
+
+
+def parent_queries(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"' in query['sql']
+    ]
+
+
+class Test20NestedParents:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_create_loads_title_once(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+                data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201
+        assert len(parent_queries(context, 'reviews_title')) == 1, (
+            'Проверьте, что при создании отзыва произведение загружается один раз'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_create_loads_review_once(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
+        review_queries = parent_queries(context, 'reviews_review')
+        assert len(review_queries) == 1, (
+            'Проверьте, что при создании комментария отзыв загружается один раз'
+        )
+        assert 'reviews_title' in review_queries[0]
+        assert not parent_queries(context, 'reviews_title'), (
+            'Проверьте, что произведение загружается вместе с отзывом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_must_belong_to_title(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        response = admin_client.get(url)
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии отзыва к другому произведению возвращают 404'
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_list_does_not_query_authors(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 3
+        assert len(parent_queries(context, User._meta.db_table)) <= 1, (
+            'Проверьте, что авторы комментариев загружаются вместе с комментариями'
+        )
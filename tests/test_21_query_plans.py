@@ -0,0 +1,106 @@
+import base64
+import json
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments
+
+NESTED_TABLES = ('reviews_review', 'reviews_comment')
+TABLE_STEP = re.compile(r'^(SCAN|SEARCH)( TABLE)? (?P<table>\w+)')
+
+
+def cursor(*position):
+    value = json.dumps({'p': list(position), 'r': 0}).encode('utf-8')
+    return base64.urlsafe_b64encode(value).decode('ascii')
+
+
+def explain(sql):
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in db_cursor.fetchall()]
+
+
+def plan_problems(context):
+    problems = []
+    for query in context.captured_queries:
+        sql = query['sql']
+        if not sql.startswith('SELECT'):
+            continue
+        indexed = set()
+        for step in explain(sql):
+            if 'TEMP B-TREE' in step:
+                problems.append((step, sql))
+            # До SQLite 3.36 шаги выглядят как `SCAN TABLE x`.
+            match = TABLE_STEP.match(step)
+            if match is None or match['table'] not in NESTED_TABLES:
+                continue
+            if 'USING' in step:
+                indexed.add(match['table'])
+            else:
+                problems.append((step, sql))
+        for table in NESTED_TABLES:
+            if f'"{table}"' in sql and table not in indexed:
+                problems.append((f'{table} без индекса', sql))
+    return problems
+
+
+class Test21QueryPlans:
+
+    def assert_plans(self, client, method, url, expected_status=200):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(client, method)(url)
+        assert response.status_code == expected_status, (
+            f'Проверьте, что запрос `{method.upper()} {url}` возвращает '
+            f'статус {expected_status}'
+        )
+        problems = plan_problems(context)
+        assert not problems, (
+            f'Проверьте, что запросы `{method.upper()} {url}` используют индексы '
+            f'без полного просмотра таблиц и временной сортировки: {problems}'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_review_queries(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        self.assert_plans(admin_client, 'get', url)
+        self.assert_plans(
+            admin_client, 'get', url + f'?cursor={cursor("2000-01-01T00:00:00", 0)}')
+        self.assert_plans(admin_client, 'get', url + f'{reviews[0]["id"]}/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comment_queries(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        self.assert_plans(admin_client, 'get', url)
+        self.assert_plans(
+            admin_client, 'get', url + f'?cursor={cursor("2000-01-01T00:00:00", 0)}')
+        self.assert_plans(admin_client, 'get', url + f'{comments[0]["id"]}/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_and_user_queries(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        self.assert_plans(admin_client, 'get', '/api/v1/titles/')
+        self.assert_plans(admin_client, 'get', f'/api/v1/titles/?cursor={cursor(0)}')
+        self.assert_plans(admin_client, 'get', f'/api/v1/titles/{titles[0]["id"]}/')
+        self.assert_plans(admin_client, 'get', '/api/v1/users/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_author_queries(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        self.assert_plans(
+            admin_client, 'delete', f'/api/v1/users/{user.username}/',
+            expected_status=204)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_full_scan_detected(self):
+        from reviews.models import Review
+
+        with CaptureQueriesContext(connection) as context:
+            list(Review.objects.filter(text='Отзыв'))
+        assert plan_problems(context), (
+            'Проверьте, что проверка планов находит полный просмотр таблицы'
+        )
@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_comments, create_titles
+
+
+class Test22SparseFields:
+
+    @staticmethod
+    def get(client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что `GET {url}` возвращает статус 200'
+        )
+        return response.json(), [query['sql'] for query in context.captured_queries]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_fields(self, admin_client):
+        create_titles(admin_client)
+        data, queries = self.get(admin_client, '/api/v1/titles/?fields=id,name')
+        for title in data['results']:
+            assert set(title) == {'id', 'name'}, (
+                'Проверьте, что параметр `fields` оставляет в ответе только '
+                'перечисленные поля'
+            )
+        assert not any('"reviews_genre"' in sql for sql in queries), (
+            'Проверьте, что жанры не загружаются, если они не запрошены'
+        )
+        assert not any('"reviews_category"' in sql for sql in queries), (
+            'Проверьте, что категория не загружается, если она не запрошена'
+        )
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что незапрошенные колонки не выбираются из базы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_omit(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data, queries = self.get(
+            admin_client, f'/api/v1/titles/{titles[0]["id"]}/?omit=description,genre')
+        assert 'description' not in data and 'genre' not in data, (
+            'Проверьте, что параметр `omit` убирает поля из ответа'
+        )
+        assert data['category']['slug'] == titles[0]['category']
+        assert not any('"description"' in sql for sql in queries)
+        assert not any('"reviews_genre"' in sql for sql in queries)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_unknown_field(self, admin_client):
+        create_titles(admin_client)
+        response = admin_client.get('/api/v1/titles/?fields=name,secret')
+        assert response.status_code == 400, (
+            'Проверьте, что запрос неизвестного поля возвращает статус 400'
+        )
+        assert 'secret' in response.json()['fields']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_reviews_comments_users(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data, queries = self.get(admin_client, f'{url}?fields=id,score&cursor=')
+        assert data['results'] and all(
+            set(review) == {'id', 'score'} for review in data['results'])
+        assert not any('"text"' in sql for sql in queries)
+
+        data, _ = self.get(
+            admin_client, f'{url}{reviews[0]["id"]}/comments/?omit=text')
+        assert data['results'] and all(
+            'text' not in comment and 'author' in comment
+            for comment in data['results'])
+
+        data, queries = self.get(admin_client, '/api/v1/users/?fields=username')
+        assert data['results'] and all(
+            set(item) == {'username'} for item in data['results'])
+        assert not any('"bio"' in sql for sql in queries)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_write_ignores_fields(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        response = admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/?fields=name', data={'year': 1999})
+        assert response.status_code == 200
+        assert response.json()['year'] == 1999, (
+            'Проверьте, что параметр `fields` не влияет на запросы изменения'
+        )
@@ -0,0 +1,49 @@
+import pytest
+from django.core.cache import cache
+
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+
+from .common import create_comments
+
+
+class Test23ValuesList:
+
+    @staticmethod
+    def both_paths(client, monkeypatch, viewset, url):
+        fast = client.get(url)
+        assert fast.status_code == 200
+        cache.clear()
+        with monkeypatch.context() as patch:
+            patch.setattr(viewset, 'values_list_enabled', False)
+            slow = client.get(url)
+        assert slow.status_code == 200
+        return fast.json(), slow.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_shape(self, admin_client, admin, monkeypatch):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        review_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        cases = (
+            (TitleViewSet, '/api/v1/titles/?cursor='),
+            (TitleViewSet, '/api/v1/titles/?cursor=&fields=id,genre,rating'),
+            (TitleViewSet, '/api/v1/titles/?cursor=&search=драма'),
+            (ReviewViewSet, review_url),
+            (ReviewViewSet, review_url + '?cursor=&omit=text'),
+            (CommentViewSet, f'{review_url}{reviews[0]["id"]}/comments/'),
+        )
+        for viewset, url in cases:
+            fast, slow = self.both_paths(admin_client, monkeypatch, viewset, url)
+            assert fast == slow, (
+                f'Проверьте, что быстрый путь `{url}` возвращает тот же ответ, '
+                'что и сериализатор'
+            )
+            assert fast['results']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_key_order(self, admin_client, admin, monkeypatch):
+        create_comments(admin_client, admin)
+        fast, slow = self.both_paths(
+            admin_client, monkeypatch, TitleViewSet, '/api/v1/titles/?cursor=')
+        for fast_title, slow_title in zip(fast['results'], slow['results']):
+            assert list(fast_title) == list(slow_title)
+            assert list(fast_title['category']) == list(slow_title['category'])
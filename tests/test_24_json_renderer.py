@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+
+from .common import create_reviews
+
+
+class Test24JSONRenderer:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_raw_utf8(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Отличный\u2028фильм', 'score': 9}, format='json')
+        response = admin_client.get(f'/api/v1/titles/{titles[1]["id"]}/reviews/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        assert 'Отличный'.encode('utf-8') in response.content, (
+            'Проверьте, что кириллица отдаётся в UTF-8 без \\u-последовательностей'
+        )
+        assert b'\\u2028' in response.content
+        assert response.json()['results'][0]['text'] == 'Отличный\u2028фильм'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_same_as_default_renderer(self, admin_client, admin, monkeypatch):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = admin_client.get(url).data
+        fast = renderers.FastJSONRenderer().render(data)
+        default = JSONRenderer().render(data)
+        assert json.loads(fast) == json.loads(default), (
+            'Проверьте, что быстрый рендерер возвращает те же данные, '
+            'что и JSONRenderer'
+        )
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(data) == default, (
+            'Проверьте, что без orjson используется стандартный JSONRenderer'
+        )
+        assert admin_client.get(url).json() == json.loads(default)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_parser(self, admin_client, monkeypatch):
+        data = {'name': 'Кино', 'slug': 'kino'}
+        response = admin_client.post(
+            '/api/v1/categories/', data=json.dumps(data, ensure_ascii=False),
+            content_type='application/json')
+        assert response.status_code == 201
+        assert response.json() == data
+        response = admin_client.post(
+            '/api/v1/categories/', data='{"name": ',
+            content_type='application/json')
+        assert response.status_code == 400, (
+            'Проверьте, что некорректный JSON возвращает статус 400'
+        )
+        monkeypatch.setattr(renderers, 'orjson', None)
+        response = admin_client.post(
+            '/api/v1/categories/', data=json.dumps({'name': 'Книги', 'slug': 'kn'}),
+            content_type='application/json')
+        assert response.status_code == 201
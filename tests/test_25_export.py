@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_comments
+
+
+def read_stream(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком'
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+class Test25Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_ndjson(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = admin_client.get('/api/v1/export/reviews/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in read_stream(response).splitlines()]
+        assert [row['id'] for row in rows] == sorted(review['id'] for review in reviews)
+        assert rows[0]['author'] == admin.username
+        assert rows[0]['title'] == titles[0]['id']
+        assert rows[0]['text'] == 'qwerty'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_csv_and_filters(self, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        response = admin_client.get(
+            f'/api/v1/export/comments/?output=csv&title={titles[0]["id"]}'
+            f'&category={titles[0]["category"]}')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert len(rows) == len(comments)
+        assert {row['author'] for row in rows} == {
+            comment['author'] for comment in comments}
+        assert rows[0]['review'] == str(reviews[0]['id'])
+
+        response = admin_client.get(f'/api/v1/export/comments/?title={titles[1]["id"]}')
+        assert read_stream(response) == '', (
+            'Проверьте, что выгрузка фильтруется по произведению'
+        )
+        response = admin_client.get('/api/v1/export/reviews/?since=2100-01-01T00:00')
+        assert read_stream(response) == '', (
+            'Проверьте, что выгрузка фильтруется по дате публикации'
+        )
+        response = admin_client.get('/api/v1/export/reviews/?output=xml')
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_admin_only(self, client, admin_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        assert client.get('/api/v1/export/reviews/').status_code == 401
+        response = auth_client(moderator).get('/api/v1/export/reviews/')
+        assert response.status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_command(self, admin_client, admin, tmp_path):
+        comments, reviews, titles, user, moderator = create_comments(admin_client, admin)
+        path = tmp_path / 'reviews.csv'
+        call_command('export', 'reviews', output='csv', chunk_size=1, file=str(path))
+        rows = list(csv.DictReader(path.open(encoding='utf-8')))
+        assert [int(row['id']) for row in rows] == sorted(
+            review['id'] for review in reviews)
+        out = io.StringIO()
+        call_command('export', 'comments', stdout=out)
+        assert len(out.getvalue().splitlines()) == len(comments)
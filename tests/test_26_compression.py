@@ -0,0 +1,108 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_categories
+
+
+class Test26Compression:
+
+    @staticmethod
+    def create_long_titles(admin_client):
+        categories = create_categories(admin_client)
+        for number in range(10):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {number}', 'year': 2000,
+                'category': categories[0]['slug'],
+                'description': 'Очень длинное описание произведения. ' * 10,
+            })
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_gzip_api_response(self, admin_client):
+        self.create_long_titles(admin_client)
+        plain = admin_client.get('/api/v1/titles/')
+        assert 'Content-Encoding' not in plain
+        assert 'Accept-Encoding' in plain['Vary'], (
+            'Проверьте, что крупные ответы содержат `Vary: Accept-Encoding`'
+        )
+        response = admin_client.get(
+            '/api/v1/titles/', HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0.8')
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что ответ API сжимается gzip'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert int(response['Content-Length']) == len(response.content)
+        assert gzip.decompress(response.content) == plain.content
+        assert response['ETag'] == 'W/' + plain['ETag']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_small_and_refused(self, admin_client):
+        self.create_long_titles(admin_client)
+        response = admin_client.get(
+            '/api/v1/categories/', HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Проверьте, что ответы меньше порога не сжимаются'
+        )
+        response = admin_client.get(
+            '/api/v1/titles/', HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        assert 'Content-Encoding' not in response
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_precompressed_static(self, client, settings, tmp_path):
+        settings.STATIC_ROOT = str(tmp_path)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        source = tmp_path / 'redoc.yaml'
+        assert (tmp_path / 'redoc.yaml.gz').exists(), (
+            'Проверьте, что collectstatic создаёт сжатую копию redoc.yaml'
+        )
+        assert gzip.decompress(
+            (tmp_path / 'redoc.yaml.gz').read_bytes()) == source.read_bytes()
+
+        response = client.get('/static/redoc.yaml', HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == 200
+        assert response['Content-Encoding'] == 'gzip'
+        assert response['Content-Type'] == 'application/yaml'
+        assert 'Accept-Encoding' in response['Vary']
+        content = b''.join(response.streaming_content)
+        assert content == (tmp_path / 'redoc.yaml.gz').read_bytes(), (
+            'Проверьте, что отдаётся заранее сжатый файл'
+        )
+
+        response = client.get('/static/redoc.yaml')
+        assert 'Content-Encoding' not in response
+        assert b''.join(response.streaming_content) == source.read_bytes()
+        assert client.get('/static/missing.yaml').status_code == 404
+        assert client.get('/static/../settings.py').status_code in (400, 404)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_static_not_modified_and_url(self, client, settings, tmp_path):
+        import importlib
+
+        from django.urls import clear_url_caches
+
+        import api_yamdb.urls
+
+        settings.STATIC_ROOT = str(tmp_path)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        response = client.get('/static/redoc.yaml')
+        response = client.get(
+            '/static/redoc.yaml',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+        assert 'Accept-Encoding' in response['Vary'], (
+            'Проверьте, что ответ 304 содержит `Vary: Accept-Encoding`'
+        )
+
+        settings.STATIC_URL = '/assets/'
+        try:
+            importlib.reload(api_yamdb.urls)
+            clear_url_caches()
+            assert client.get('/assets/redoc.yaml').status_code == 200, (
+                'Проверьте, что адрес статики строится из `STATIC_URL`'
+            )
+            assert client.get('/static/redoc.yaml').status_code == 404
+        finally:
+            settings.STATIC_URL = '/static/'
+            importlib.reload(api_yamdb.urls)
+            clear_url_caches()
@@ -0,0 +1,95 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.throttling import TokenBucketStore
+
+
+class Test27Throttling:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_username_bucket(self, client):
+        data = {'username': 'bot', 'email': 'bot@yamdb.fake'}
+        statuses = [client.post(self.url_signup, data=data).status_code
+                    for _ in range(3)]
+        assert 429 not in statuses
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.url_signup, data=data)
+        assert response.status_code == 429, (
+            'Проверьте, что повторные регистрации одного имени ограничиваются'
+        )
+        assert int(response['Retry-After']) > 0, (
+            'Проверьте, что ответ 429 содержит заголовок `Retry-After`'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что ограничение срабатывает до обращения к базе данных'
+        )
+        response = client.post(
+            self.url_signup, data={'username': 'other', 'email': 'o@yamdb.fake'})
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ip_bucket(self, client):
+        statuses = [
+            client.post(self.url_token, data={
+                'username': f'user{number}', 'confirmation_code': '1'}).status_code
+            for number in range(31)
+        ]
+        assert statuses[:30].count(429) == 0
+        assert statuses[30] == 429, (
+            'Проверьте, что запросы токена ограничиваются по IP-адресу'
+        )
+        response = client.post(
+            self.url_token, data={'username': 'x', 'confirmation_code': '1'},
+            REMOTE_ADDR='10.0.0.2')
+        assert response.status_code != 429
+
+    def test_03_bucket_refill(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('api.throttling.time.monotonic', lambda: now[0])
+        store = TokenBucketStore(maxsize=2)
+        assert store.consume('a', capacity=2, refill_rate=1) == 0
+        assert store.consume('a', capacity=2, refill_rate=1) == 0
+        assert store.consume('a', capacity=2, refill_rate=1) == pytest.approx(1)
+        now[0] += 0.5
+        assert store.consume('a', capacity=2, refill_rate=1) == pytest.approx(0.5)
+        now[0] += 1
+        assert store.consume('a', capacity=2, refill_rate=1) == 0
+        store.consume('b', capacity=2, refill_rate=1)
+        store.consume('c', capacity=2, refill_rate=1)
+        assert len(store._buckets) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_forwarded_for_ignored(self, client):
+        statuses = [
+            client.post(self.url_signup, data={
+                'username': f'bot{number}', 'email': f'bot{number}@yamdb.fake'},
+                HTTP_X_FORWARDED_FOR=f'192.0.2.{number}').status_code
+            for number in range(11)
+        ]
+        assert statuses[:10].count(429) == 0
+        assert statuses[10] == 429, (
+            'Проверьте, что ограничение по IP-адресу нельзя обойти, '
+            'подменяя заголовок `X-Forwarded-For`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_token_username_failures_only(self, client, user):
+        valid = {'username': user.username,
+                 'confirmation_code': user.confirmation_code}
+        invalid = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(12):
+            response = client.post(self.url_token, data=valid)
+            assert response.status_code == 200, (
+                'Проверьте, что успешные запросы токена не расходуют '
+                'лимит имени пользователя'
+            )
+        statuses = [client.post(self.url_token, data=invalid).status_code
+                    for _ in range(11)]
+        assert statuses[:10] == [400] * 10
+        assert statuses[10] == 429, (
+            'Проверьте, что неудачные запросы токена ограничиваются '
+            'по имени пользователя'
+        )
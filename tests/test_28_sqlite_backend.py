@@ -0,0 +1,53 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api_yamdb.backends.sqlite3.base import DatabaseWrapper
+
+
+def pragma(conn, name):
+    with conn.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def make_connection(tmp_path, **settings):
+    settings_dict = dict(connection.settings_dict)
+    settings_dict.update(NAME=str(tmp_path / 'db.sqlite3'), **settings)
+    return DatabaseWrapper(settings_dict, alias='pragmas')
+
+
+class Test28SQLiteBackend:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas_applied(self, tmp_path):
+        conn = make_connection(tmp_path)
+        try:
+            assert pragma(conn, 'journal_mode') == 'wal', (
+                'Проверьте, что новое соединение переводится в режим WAL'
+            )
+            assert pragma(conn, 'synchronous') == 1
+            assert pragma(conn, 'busy_timeout') == 5000
+            assert pragma(conn, 'cache_size') == -20000
+            assert pragma(conn, 'temp_store') == 2
+        finally:
+            conn.close()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalid_pragma(self, tmp_path):
+        conn = make_connection(tmp_path, PRAGMAS={'journal_mode; DROP': 'x'})
+        with pytest.raises(ImproperlyConfigured):
+            conn.ensure_connection()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_immediate_transactions(self):
+        assert connection.settings_dict['CONN_MAX_AGE'] > 0, (
+            'Проверьте, что включены постоянные соединения'
+        )
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                pass
+        assert context.captured_queries[0]['sql'] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что транзакции сразу берут блокировку записи'
+        )
@@ -0,0 +1,89 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api_yamdb.middleware import ReplicaRoutingMiddleware
+from api_yamdb.routers import STICKY_COOKIE, ReplicaRouter, replica_reads
+from reviews.models import Review, Title, User
+
+
+@pytest.fixture
+def replica_settings(settings):
+    settings.DATABASES = {**settings.DATABASES, 'replica': {}}
+    return settings
+
+
+class Test29ReplicaRouting:
+
+    def test_01_router(self, replica_settings):
+        router = ReplicaRouter()
+        assert router.db_for_read(Title) is None
+        token = replica_reads.set(True)
+        try:
+            assert router.db_for_read(Title) == 'replica'
+            assert router.db_for_read(Review) == 'replica'
+            assert router.db_for_read(Title.genre.through) == 'replica'
+            assert router.db_for_read(User) is None, (
+                'Проверьте, что пользователи всегда читаются из основной базы'
+            )
+            assert router.db_for_write(Title) == 'default'
+        finally:
+            replica_reads.reset(token)
+        assert router.allow_migrate('replica', 'reviews') is False
+
+    def test_02_no_replica_configured(self):
+        token = replica_reads.set(True)
+        try:
+            assert ReplicaRouter().db_for_read(Title) is None
+        finally:
+            replica_reads.reset(token)
+
+    @pytest.mark.django_db
+    def test_03_sticky_after_write(self, replica_settings):
+        seen = []
+
+        def view(request):
+            seen.append(replica_reads.get())
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        url = '/api/v1/titles/1/reviews/'
+        middleware(factory.get(url))
+        response = middleware(factory.post(url))
+        sticky = response.cookies[STICKY_COOKIE]
+        assert int(sticky['max-age']) == replica_settings.REPLICA_LAG
+        # Отметка едет вместе с клиентом, кеш процесса для неё не нужен.
+        cache.clear()
+        writer = factory.get(url)
+        writer.COOKIES[STICKY_COOKIE] = sticky.value
+        middleware(writer)
+        forged = factory.get(url)
+        forged.COOKIES[STICKY_COOKIE] = '1'
+        middleware(forged)
+        middleware(factory.get('/admin/'))
+        assert seen == [True, False, False, True, False], (
+            'Проверьте, что после записи клиент читает из основной базы, '
+            'а остальные клиенты продолжают читать из реплики'
+        )
+        assert replica_reads.get() is False
+
+    def test_04_sync_replica(self, tmp_path):
+        source = tmp_path / 'source.sqlite3'
+        target = tmp_path / 'replica.sqlite3'
+        with sqlite3.connect(str(source)) as db:
+            db.execute('CREATE TABLE item (name TEXT)')
+            db.executemany('INSERT INTO item VALUES (?)', [('a',), ('b',)])
+        db.close()
+        call_command('sync_replica', source=str(source), target=str(target),
+                     pages=1, stdout=StringIO())
+        replica = sqlite3.connect(str(target))
+        try:
+            assert replica.execute('SELECT COUNT(*) FROM item').fetchone()[0] == 2
+        finally:
+            replica.close()
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+
+from api_yamdb.asgi_handlers import (CatalogSnapshotHandler, LifespanHandler,
+                                     SnapshotStore, WSGIBridge)
+from reviews.models import Category, Title
+
+
+class CountingBridge(WSGIBridge):
+
+    def __init__(self):
+        super().__init__(WSGIHandler(), 1)
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await super().__call__(scope, receive, send)
+
+
+def get_scope(path, method='GET', headers=()):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'testserver'), *headers],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+
+def call(application, scope, body=b''):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    start = messages[0]
+    return (start['status'], dict(start['headers']),
+            b''.join(message.get('body', b'') for message in messages[1:]))
+
+
+@pytest.fixture
+def handler():
+    bridge = CountingBridge()
+    yield CatalogSnapshotHandler(bridge, SnapshotStore(100, 600))
+    bridge.shutdown()
+
+
+class Test30ASGI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_snapshot(self, handler, admin_client):
+        Category.objects.create(name='Фильм', slug='films')
+        status, headers, body = call(
+            handler, get_scope('/api/v1/categories/'))
+        assert status == 200
+        assert b'films' in body
+        status, _, snapshot_body = call(
+            handler, get_scope('/api/v1/categories/'))
+        assert status == 200 and snapshot_body == body
+        assert handler.application.calls == 1, (
+            'Проверьте, что повторный анонимный запрос категорий '
+            'отдаётся из снимка без обращения к Django'
+        )
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Книга', 'slug': 'books'})
+        _, _, body = call(handler, get_scope('/api/v1/categories/'))
+        assert handler.application.calls == 2
+        assert b'books' in body, (
+            'Проверьте, что после изменения каталога снимок не используется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_not_modified(self, handler):
+        title = Title.objects.create(name='Поворот туда', year=2000)
+        url = f'/api/v1/titles/{title.id}/'
+        _, headers, _ = call(handler, get_scope(url))
+        etag = headers[b'etag']
+        status, headers, body = call(
+            handler, get_scope(url, headers=[(b'if-none-match', etag)]))
+        assert status == 304 and body == b'', (
+            'Проверьте, что снимок отвечает 304 на совпадающий `If-None-Match`'
+        )
+        assert handler.application.calls == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bypass(self, handler, token_admin):
+        authorization = f'Bearer {token_admin["access"]}'.encode()
+        for _ in range(2):
+            status, _, _ = call(handler, get_scope(
+                '/api/v1/genres/',
+                headers=[(b'authorization', authorization)]))
+            assert status == 200
+        assert handler.application.calls == 2, (
+            'Проверьте, что запросы с авторизацией не попадают в снимок'
+        )
+        status, _, body = call(handler, get_scope(
+            '/api/v1/categories/', method='POST',
+            headers=[(b'authorization', authorization),
+                     (b'content-type', b'application/json')]),
+            body='{"name": "Музыка", "slug": "music"}'.encode())
+        assert status == 201 and b'music' in body, (
+            'Проверьте, что тело запроса передаётся через ASGI'
+        )
+        assert Category.objects.filter(slug='music').exists()
+
+    def test_04_lifespan(self):
+        stopped = []
+        messages = iter([
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent = []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        application = LifespanHandler(None, lambda: stopped.append(True))
+        asyncio.run(application({'type': 'lifespan'}, receive, send))
+        assert sent == [
+            'lifespan.startup.complete', 'lifespan.shutdown.complete']
+        assert stopped == [True]
+
+    def test_05_application(self):
+        from api_yamdb.asgi import application
+
+        assert isinstance(application, LifespanHandler), (
+            'Проверьте, что `api_yamdb.asgi` предоставляет ASGI-приложение'
+        )
+
+    def test_06_replica_timeout(self, handler, settings):
+        assert handler.get_timeout() == 600
+        settings.DATABASES = {**settings.DATABASES, 'replica': {}}
+        assert handler.get_timeout() == settings.REPLICA_LAG, (
+            'Проверьте, что при настроенной реплике снимок живёт не дольше '
+            '`REPLICA_LAG`'
+        )
+        store = SnapshotStore(10, 600)
+        store.set('key', 'snapshot', ttl=-1)
+        assert store.get('key') is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_server_timing(self, handler, settings):
+        settings.SERVER_TIMING = True
+        _, headers, _ = call(handler, get_scope('/api/v1/genres/'))
+        assert b'db;' in headers[b'server-timing']
+        _, headers, _ = call(handler, get_scope('/api/v1/genres/'))
+        assert handler.application.calls == 1
+        timing = headers[b'server-timing'].decode()
+        assert timing.startswith('snapshot') and 'db;' not in timing, (
+            'Проверьте, что снимок не повторяет `Server-Timing` исходного '
+            'запроса'
+        )
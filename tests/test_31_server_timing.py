@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+
+from reviews.models import Review, Title
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(','):
+        name, *params = metric.strip().split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+class Test31ServerTiming:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_disabled(self, client):
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert not response.has_header('Server-Timing'), (
+            'Проверьте, что заголовок `Server-Timing` выключен по умолчанию'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_read(self, settings, user_client, user, caplog):
+        settings.SERVER_TIMING = True
+        title = Title.objects.create(name='Поворот туда', year=2000)
+        Review.objects.create(title=title, author=user, text='Текст', score=5)
+        with caplog.at_level(logging.INFO, logger='api_yamdb.timing'):
+            response = user_client.get(f'/api/v1/titles/{title.id}/reviews/')
+        assert response.status_code == 200
+        metrics = parse_server_timing(response['Server-Timing'])
+        for name in ('db', 'auth', 'perm', 'render', 'total'):
+            assert name in metrics, (
+                f'Проверьте, что `Server-Timing` содержит метрику `{name}`'
+            )
+            assert float(metrics[name]['dur']) >= 0
+        assert metrics['db']['desc'].strip('"').split()[0].isdigit()
+        assert 'validation' not in metrics
+        records = [record for record in caplog.records
+                   if record.name == 'api_yamdb.timing']
+        assert len(records) == 1, (
+            'Проверьте, что на каждый запрос пишется одна строка журнала'
+        )
+        timings = records[0].timings
+        assert timings['view'] == 'reviews-list'
+        assert timings['status'] == 200
+        assert timings['queries'] >= 1
+        assert f'queries={timings["queries"]}' in records[0].getMessage()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_validation(self, settings, admin_client):
+        settings.SERVER_TIMING = True
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == 201
+        metrics = parse_server_timing(response['Server-Timing'])
+        assert 'validation' in metrics, (
+            'Проверьте, что время валидации сериализатора попадает '
+            'в `Server-Timing`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_api_view_validation(self, settings, client):
+        settings.SERVER_TIMING = True
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'reader', 'email': 'reader@yamdb.fake'})
+        assert response.status_code == 200
+        metrics = parse_server_timing(response['Server-Timing'])
+        for name in ('auth', 'perm', 'throttle', 'validation'):
+            assert name in metrics, (
+                f'Проверьте, что `Server-Timing` регистрации содержит '
+                f'метрику `{name}`'
+            )
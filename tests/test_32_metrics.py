@@ -0,0 +1,149 @@
+import json
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from api_yamdb.metrics import (HOSTNAME, MetricsStore, metrics_store,
+                               record_request)
+from reviews.models import Title
+
+
+def get_samples(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+class Test32Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_route_labels(self, client, admin_client):
+        title = Title.objects.create(name='Поворот туда', year=2000)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{title.id}/reviews/')
+        admin_client.get('/api/v1/users/')
+        samples = get_samples(client)
+        assert samples[
+            'yamdb_requests_total{basename="titles",action="list",'
+            'method="GET",status="200"}'] == 2, (
+            'Проверьте, что запросы считаются по basename и action'
+        )
+        assert samples[
+            'yamdb_request_duration_seconds_count'
+            '{basename="reviews",action="list"}'] == 1
+        assert samples[
+            'yamdb_request_duration_seconds_bucket'
+            '{basename="titles",action="list",le="+Inf"}'] == 2
+        assert samples[
+            'yamdb_response_size_bytes_sum'
+            '{basename="titles",action="list"}'] > 0
+        assert samples[
+            'yamdb_db_queries_sum{basename="reviews",action="list"}'] >= 1, (
+            'Проверьте, что считаются запросы к базе данных'
+        )
+        assert (
+            'yamdb_requests_total{basename="users",action="list",'
+            'method="GET",status="200"}' in samples
+        )
+
+    def test_02_thread_shards(self):
+        store = MetricsStore()
+        labels = (('basename', 'titles'), ('action', 'list'))
+
+        def work():
+            for _ in range(1000):
+                store.inc('yamdb_requests_total', labels)
+                store.observe('yamdb_db_queries', labels, 3)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        collected = store.collect()
+        assert collected[('yamdb_requests_total', labels)] == 4000, (
+            'Проверьте, что значения потоков суммируются при сборе'
+        )
+        histogram = collected[('yamdb_db_queries', labels)]
+        assert sum(histogram[:-1]) == 4000
+        assert histogram[-1] == 12000
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_multiprocess(self, client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        other = MetricsStore()
+        other.inc('yamdb_requests_total', (
+            ('basename', 'genres'), ('action', 'list'),
+            ('method', 'GET'), ('status', '200')), 5)
+        other.flush(force=True)
+        record_request('genres', 'list', 'GET', 200, 0.01, 1)
+        metrics_store.flush(force=True)
+        samples = get_samples(client)
+        assert samples[
+            'yamdb_requests_total{basename="genres",action="list",'
+            'method="GET",status="200"}'] == 6, (
+            'Проверьте, что в многопроцессном режиме значения '
+            'всех процессов объединяются'
+        )
+        assert len(list(tmp_path.glob('*.json'))) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_dead_process_files(self, client, settings, tmp_path):
+        settings.METRICS_DIR = str(tmp_path)
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        labels = [['basename', 'genres'], ['action', 'list'],
+                  ['method', 'GET'], ['status', '200']]
+        stale = tmp_path / f'{HOSTNAME}_{process.pid}_stale.json'
+        stale.write_text(json.dumps([['yamdb_requests_total', labels, 7]]))
+        remote = tmp_path / f'other-host_{process.pid}_remote.json'
+        remote.write_text(json.dumps([['yamdb_requests_total', labels, 2]]))
+        name = ('yamdb_requests_total{basename="genres",action="list",'
+                'method="GET",status="200"}')
+        for _ in range(2):
+            samples = get_samples(client)
+            assert samples[name] == 9, (
+                'Проверьте, что значения завершившихся процессов '
+                'сохраняются и не учитываются повторно'
+            )
+        assert not stale.exists(), (
+            'Проверьте, что файл завершившегося процесса переносится '
+            'в общий файл'
+        )
+        assert remote.exists(), (
+            'Проверьте, что по PID не судят о процессах другого узла'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_asgi_snapshot_hits(self, client):
+        from django.core.handlers.wsgi import WSGIHandler
+
+        from api_yamdb.asgi_handlers import (CatalogSnapshotHandler,
+                                             SnapshotStore, WSGIBridge)
+
+        from .test_30_asgi import call, get_scope
+
+        bridge = WSGIBridge(WSGIHandler(), 1)
+        handler = CatalogSnapshotHandler(bridge, SnapshotStore(10, 600))
+        try:
+            for _ in range(3):
+                call(handler, get_scope('/api/v1/categories/'))
+        finally:
+            bridge.shutdown()
+        samples = get_samples(client)
+        assert samples[
+            'yamdb_requests_total{basename="categories",action="list",'
+            'method="GET",status="200"}'] == 3, (
+            'Проверьте, что ответы из снимка ASGI попадают в метрики'
+        )
+        assert samples[
+            'yamdb_db_queries_count{basename="categories",action="list"}'] == 3